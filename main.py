@@ -1,4 +1,95 @@
+import time
+
+START = time.perf_counter()  # Before the other imports, which are timed as the first startup phase
+
+# The imports come after START on purpose, the startup report times them
+# pylint: disable=wrong-import-position
+import argparse
+from src.cli import add_capture_arguments, parse_lod
 from src.rock_paper_scissors import RockPaperScissors
+from src.simulation.rules import DEFAULT_RULES, RULES
+from src.utils import constants
+from src.utils.startup import StartupTimer
+# pylint: enable=wrong-import-position
 
 if __name__ == "__main__":
-    RockPaperScissors().run_game()
+    parser = argparse.ArgumentParser(description="Rock Paper Scissors simulation.")
+    parser.add_argument("--seed", type=int, default=None, help="seed of every match")
+    parser.add_argument(
+        "--record-dir", default=None, help="directory to record replays of the matches into"
+    )
+    parser.add_argument("--replay", default=None, help="replay file to play back")
+    parser.add_argument(
+        "--profile", default=None, help="CSV or JSON file to write the frame timings into on exit"
+    )
+    parser.add_argument(
+        "--world-width", type=int, default=constants.WORLD_WIDTH, help="width of the world"
+    )
+    parser.add_argument(
+        "--world-height", type=int, default=constants.WORLD_HEIGHT, help="height of the world"
+    )
+    parser.add_argument(
+        "--rules", choices=RULES, default=DEFAULT_RULES, help="species and who eats whom"
+    )
+    parser.add_argument(
+        "--timeseries-dir",
+        default=None,
+        help="directory to write the population time series of the matches into",
+    )
+    parser.add_argument(
+        "--snapshot-dir", default=None, help="directory to save the snapshots taken with F5 into"
+    )
+    add_capture_arguments(parser)
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="run the simulation on a worker thread while the frames are rendered",
+    )
+    parser.add_argument(
+        "--lod",
+        type=parse_lod,
+        default=1,
+        help="steps between two searches of the sprites far from any prey and hunter, "
+        "or auto to raise it while the simulation cannot keep up",
+    )
+    parser.add_argument(
+        "--target-refresh",
+        type=int,
+        default=1,
+        help="steps after which the sprites search for their prey and hunter again, "
+        "keeping them in between while they are still close (default: 1, search every step)",
+    )
+    parser.add_argument(
+        "--validate-targets",
+        action="store_true",
+        help="compare the kept targets with an exact search and show the difference",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print how long every phase of the startup takes",
+    )
+    args = parser.parse_args()
+    if args.target_refresh < 1:
+        parser.error("--target-refresh must be at least 1")
+    startup = StartupTimer(START, enabled=args.startup_report)
+    startup.mark("imports")
+    RockPaperScissors(
+        seed=args.seed,
+        record_dir=args.record_dir,
+        replay=args.replay,
+        profile=args.profile,
+        world_width=args.world_width,
+        world_height=args.world_height,
+        rules=RULES[args.rules],
+        timeseries_dir=args.timeseries_dir,
+        snapshot_dir=args.snapshot_dir,
+        capture_dir=args.capture_dir,
+        capture_format=args.capture_format,
+        capture_size=args.capture_size,
+        threaded=args.threaded,
+        lod=args.lod,
+        target_refresh=args.target_refresh,
+        validate_targets=args.validate_targets,
+        startup=startup,
+    ).run_game()
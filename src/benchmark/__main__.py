@@ -0,0 +1,94 @@
+"""
+Command line entry point of the benchmark suite: `python -m src.benchmark`.
+
+Runs the suite, prints a table of the results, writes them as JSON and optionally compares them
+with a baseline written by a previous run. Exits with status 1 if a regression is found.
+"""
+import argparse
+import json
+import sys
+from src.benchmark.compare import compare
+from src.benchmark.suite import run_suite
+
+
+def main(argv=None):
+    """
+    Parse the command line arguments, run the suite and report the results.
+
+    Args:
+        argv (list): The command line arguments (default: `sys.argv[1:]`).
+
+    Returns:
+        int: The exit status, 1 if a regression against the baseline was found.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmark",
+        description="Time the simulation hot paths across group sizes and speeds.",
+    )
+    parser.add_argument(
+        "--group-sizes",
+        type=int,
+        nargs="+",
+        default=[10, 30, 150, 500],
+        help="group sizes to benchmark, in the default world",
+    )
+    parser.add_argument(
+        "--speeds", type=int, nargs="+", default=[2, 10], help="speeds to benchmark"
+    )
+    parser.add_argument("--steps", type=int, default=50, help="measured steps")
+    parser.add_argument("--warmup", type=int, default=20, help="steps before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulations")
+    parser.add_argument(
+        "--no-render", action="store_true", help="skip the rendering benchmark"
+    )
+    parser.add_argument(
+        "--output", default="benchmark.json", help="file to write the results to"
+    )
+    parser.add_argument("--baseline", default=None, help="results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown flagged as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.group_sizes,
+        args.speeds,
+        steps=args.steps,
+        warmup=args.warmup,
+        seed=args.seed,
+        render=not args.no_render,
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"{'benchmark':<16}{'size':>6}{'speed':>6}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'per sec':>10}")
+    for result in results["results"]:
+        print(
+            f"{result['benchmark']:<16}{result['group_size']:>6}{result['speed']:>6}"
+            f"{result['mean_ms']:>10.3f}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+            f"{result['per_second']:>10.1f}"
+        )
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = [
+        comparison
+        for comparison in compare(results, baseline, args.threshold)
+        if comparison["regression"]
+    ]
+    for comparison in regressions:
+        print(
+            f"REGRESSION {comparison['benchmark']} size {comparison['group_size']} "
+            f"speed {comparison['speed']}: {comparison['baseline_ms']:.3f} ms -> "
+            f"{comparison['mean_ms']:.3f} ms ({comparison['ratio']:.2f}x)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+This module compares benchmark results against a saved baseline to flag regressions.
+"""
+
+
+def get_key(result):
+    """
+    Get the key identifying a benchmark result across runs.
+
+    Args:
+        result (dict): The summary of a benchmark.
+
+    Returns:
+        tuple: The benchmark name, group size and speed.
+    """
+    return (result["benchmark"], result["group_size"], result["speed"])
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compare the mean times of benchmark results with a baseline.
+
+    Args:
+        results (dict): The output of `run_suite`.
+        baseline (dict): A previous output of `run_suite`.
+        threshold (float): The relative slowdown tolerated before flagging a regression (default: 0.1).
+
+    Returns:
+        list: A dictionary for every benchmark present in both runs, with the baseline and
+        current mean times, their ratio and whether it is a regression.
+    """
+    baseline_means = {get_key(result): result["mean_ms"] for result in baseline["results"]}
+    comparisons = []
+    for result in results["results"]:
+        key = get_key(result)
+        if key not in baseline_means:
+            continue
+        ratio = result["mean_ms"] / baseline_means[key]
+        comparisons.append(
+            {
+                "benchmark": result["benchmark"],
+                "group_size": result["group_size"],
+                "speed": result["speed"],
+                "baseline_ms": baseline_means[key],
+                "mean_ms": result["mean_ms"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return comparisons
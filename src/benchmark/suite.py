@@ -0,0 +1,174 @@
+"""
+This module times the simulation hot paths across a grid of group sizes and speeds.
+
+Every benchmark runs on a seeded simulation, so two runs of the suite time the same states. Each
+measurement is repeated for a number of steps and summarized as mean, median and 99th percentile.
+Rendering is timed on a `GameScreen` drawing to a dummy SDL video driver, so no window is needed.
+"""
+import os
+import platform
+import time
+import numpy as np
+from src.simulation.engine import Simulation
+from src.utils import constants
+
+
+def summarize(name, group_size, speed, timings):
+    """
+    Summarize the timings of one benchmark.
+
+    Args:
+        name (str): The name of the benchmark.
+        group_size (int): The number of sprites in each contender group.
+        speed (int): The speed of the sprites.
+        timings (list): The measured durations in nanoseconds.
+
+    Returns:
+        dict: The mean, median and 99th percentile in milliseconds and the rate per second.
+    """
+    milliseconds = np.array(timings) / 1e6
+    mean = milliseconds.mean()
+    return {
+        "benchmark": name,
+        "group_size": group_size,
+        "speed": speed,
+        "runs": len(timings),
+        "mean_ms": mean,
+        "p50_ms": float(np.percentile(milliseconds, 50)),
+        "p99_ms": float(np.percentile(milliseconds, 99)),
+        "per_second": 1000 / mean if mean > 0 else float("inf"),
+    }
+
+
+def time_call(function, *args):
+    """
+    Time a single call.
+
+    Args:
+        function (callable): The function to call.
+        *args: The arguments of the call.
+
+    Returns:
+        int: The duration of the call in nanoseconds.
+    """
+    start = time.perf_counter_ns()
+    function(*args)
+    return time.perf_counter_ns() - start
+
+
+def benchmark_simulation(group_size, speed, steps, warmup, seed):
+    """
+    Time a simulation step and each of its phases.
+
+    Args:
+        group_size (int): The number of sprites in each contender group.
+        speed (int): The speed of the sprites.
+        steps (int): The number of measured steps.
+        warmup (int): The number of steps simulated before measuring.
+        seed (int): The seed of the simulation.
+
+    Returns:
+        list: The summary of every benchmark.
+    """
+    simulation = Simulation(speed, group_size, np.random.default_rng(seed))
+    for _ in range(warmup):
+        simulation.step()
+    # The phases move sprites and draw random numbers, so they run on a copy of the simulation
+    probe = Simulation(speed, group_size, np.random.default_rng(seed))
+
+    timings = {
+        name: []
+        for name in ("step", "find_closest", "find_eaten", "settle")
+    }
+    for _ in range(steps):
+        if simulation.get_winner() is not None:
+            simulation = Simulation(speed, group_size, np.random.default_rng(seed))
+        timings["step"].append(time_call(simulation.step))
+
+        # Phases are timed for every group, on a copy of the state the step left behind
+        probe.x[:] = simulation.x
+        probe.y[:] = simulation.y
+        probe.species[:] = simulation.species
+        probe.nearest_indexes.clear()
+        for name in ("find_closest", "find_eaten", "settle"):
+            timings[name].append(0)
+        for species in range(len(probe.rules)):
+            movers = np.flatnonzero(probe.species == species)
+            start = time.perf_counter_ns()
+            prey = probe.find_closest(movers, probe.rules.prey[species])
+            timings["find_closest"][-1] += time.perf_counter_ns() - start
+            timings["find_eaten"][-1] += time_call(probe.find_eaten, movers, prey)
+            timings["settle"][-1] += time_call(
+                probe.settle, movers, species, probe.x[movers], probe.y[movers]
+            )
+
+    return [
+        summarize(name, group_size, speed, values) for name, values in timings.items()
+    ]
+
+
+def benchmark_rendering(group_size, speed, steps, warmup, seed):
+    """
+    Time `GameScreen.update_sprites`, which draws the sprites at the positions of the last step.
+
+    Args:
+        group_size (int): The number of sprites in each contender group.
+        speed (int): The speed of the sprites.
+        steps (int): The number of measured frames.
+        warmup (int): The number of steps simulated before measuring.
+        seed (int): The seed of the simulation.
+
+    Returns:
+        list: The summary of the benchmark, empty if Pygame is not installed.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame
+        from src.entities.game_screen import GameScreen
+    except ImportError:
+        return []
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((constants.RESOLUTION, constants.RESOLUTION))
+    game = GameScreen(screen, speed, group_size, seed=seed)
+    for _ in range(warmup):
+        game.simulation.step()
+
+    timings = []
+    for _ in range(steps):
+        game.simulation.step()
+        timings.append(time_call(game.update_sprites))
+    return [summarize("update_sprites", group_size, speed, timings)]
+
+
+def run_suite(group_sizes, speeds, steps=50, warmup=20, seed=0, render=True):
+    """
+    Run every benchmark for every combination of group size and speed.
+
+    Args:
+        group_sizes (list): The group sizes to benchmark.
+        speeds (list): The speeds to benchmark.
+        steps (int): The number of measured steps of each benchmark (default: 50).
+        warmup (int): The number of steps simulated before measuring (default: 20).
+        seed (int): The seed of the simulations (default: 0).
+        render (bool): Whether to benchmark rendering too (default: True).
+
+    Returns:
+        dict: The settings of the run, a description of the machine and the summaries.
+    """
+    results = []
+    for group_size in group_sizes:
+        for speed in speeds:
+            results += benchmark_simulation(group_size, speed, steps, warmup, seed)
+            if render:
+                results += benchmark_rendering(group_size, speed, steps, warmup, seed)
+    return {
+        "settings": {"steps": steps, "warmup": warmup, "seed": seed},
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
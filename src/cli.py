@@ -0,0 +1,494 @@
+"""
+This module is the command line entry point for running simulations without a game window.
+
+Every command imports the modules it runs when it is called, so parsing the arguments stays fast
+and a command only loads what it uses: SciPy is not loaded to print the help, nor Pygame to run
+a match. The game imports its argument helpers from here as well.
+"""
+import argparse
+import json
+import os
+import sys
+from src.simulation.rules import DEFAULT_RULES, RULES
+from src.utils import constants
+
+
+def main(argv=None):
+    """
+    Parse the command line arguments and run the selected command.
+
+    Args:
+        argv (list): The command line arguments (default: `sys.argv[1:]`).
+    """
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    args.command(args)
+
+
+def create_parser():
+    """
+    Create the argument parser with a sub-parser for every command.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run Rock Paper Scissors simulations without a game window."
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run matches and print their results as JSON lines."
+    )
+    add_match_arguments(run_parser)
+    run_parser.add_argument(
+        "--matches", type=int, default=1, help="number of matches to run"
+    )
+    run_parser.add_argument(
+        "--record-dir", default=None, help="directory to record replays of the matches into"
+    )
+    run_parser.add_argument(
+        "--timeseries-dir",
+        default=None,
+        help="directory to write the population time series of the matches into",
+    )
+    run_parser.add_argument(
+        "--sample-interval", type=int, default=1, help="steps between two time series samples"
+    )
+    run_parser.add_argument(
+        "--snapshot-dir", default=None, help="directory to save snapshots of the matches into"
+    )
+    run_parser.add_argument(
+        "--snapshot-steps",
+        type=parse_values,
+        default=[],
+        help="steps to save a snapshot at, as a list like 500,1000 or a range like 0-5000:500",
+    )
+    add_endgame_argument(run_parser)
+    run_parser.set_defaults(command=run_command)
+
+    branch_parser = subparsers.add_parser(
+        "branch",
+        help="Continue a match from a snapshot and print the result of every branch as JSON lines.",
+    )
+    branch_parser.add_argument("snapshot", help="snapshot file to continue from")
+    branch_parser.add_argument(
+        "--branches", type=int, default=1, help="number of continuations to run"
+    )
+    branch_parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="seed of the first branch (default: continue exactly like the original match, "
+        "which needs a single branch)",
+    )
+    branch_parser.add_argument(
+        "--max-steps", type=int, default=None, help="step limit, counted from the start of the match"
+    )
+    add_endgame_argument(branch_parser)
+    branch_parser.set_defaults(command=branch_command)
+
+    render_parser = subparsers.add_parser(
+        "render", help="Render a match off-screen, capture its frames and print its result as JSON."
+    )
+    add_match_arguments(render_parser)
+    add_capture_arguments(render_parser, capture_dir="captures")
+    render_parser.add_argument(
+        "--frame-interval", type=int, default=1, help="steps between two rendered frames"
+    )
+    render_parser.set_defaults(command=render_command)
+
+    tournament_parser = subparsers.add_parser(
+        "tournament",
+        help="Run matches on all cores and print the winning probabilities as JSON.",
+    )
+    add_match_arguments(tournament_parser)
+    tournament_parser.add_argument(
+        "--matches", type=int, default=1000, help="number of matches to run"
+    )
+    tournament_parser.add_argument(
+        "--workers", type=int, default=None, help="number of worker processes"
+    )
+    tournament_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="matches sent to a worker at once (default: a few chunks per worker, at most 10)",
+    )
+    add_endgame_argument(tournament_parser)
+    tournament_parser.set_defaults(command=tournament_command)
+
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        help="Run a grid of speeds, group sizes and seeds, caching every result, "
+        "and print the win rates of every grid cell.",
+    )
+    sweep_parser.add_argument(
+        "--speeds",
+        type=parse_values,
+        default=[2],
+        help="speeds of the grid, as a list like 1,2,5 or a range like 1-10",
+    )
+    sweep_parser.add_argument(
+        "--group-sizes",
+        type=parse_values,
+        default=[30],
+        help="group sizes of the grid, as a list like 10,50 or a range like 10-150:10",
+    )
+    sweep_parser.add_argument(
+        "--seeds", type=int, default=10, help="number of seeds of every grid cell"
+    )
+    sweep_parser.add_argument(
+        "--seed", type=int, default=0, help="first seed, the seeds are seed to seed + seeds - 1"
+    )
+    sweep_parser.add_argument(
+        "--max-steps", type=int, default=None, help="step limit of a match"
+    )
+    add_world_arguments(sweep_parser)
+    add_endgame_argument(sweep_parser)
+    sweep_parser.add_argument(
+        "--cache", default="sweep.sqlite", help="result database, reused to resume a sweep"
+    )
+    sweep_parser.add_argument(
+        "--workers", type=int, default=None, help="number of worker processes"
+    )
+    sweep_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="matches sent to a worker at once (default: a few chunks per worker, at most 10)",
+    )
+    sweep_parser.add_argument(
+        "--report",
+        action="store_true",
+        help="only print the table of the cached results, without running matches",
+    )
+    sweep_parser.add_argument(
+        "--json", action="store_true", help="print the table as JSON"
+    )
+    sweep_parser.set_defaults(command=sweep_command)
+    return parser
+
+
+def parse_values(text):
+    """
+    Parse a list of integers like 1,2,5 or an inclusive range like 1-10 or 10-150:10.
+
+    Args:
+        text (str): The list or range.
+
+    Returns:
+        list: The integers.
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is neither a list nor a range of integers.
+    """
+    try:
+        if "-" in text:
+            bounds, _, step = text.partition(":")
+            start, end = bounds.split("-")
+            return list(range(int(start), int(end) + 1, int(step or 1)))
+        return [int(value) for value in text.split(",")]
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid list or range: {text}") from error
+
+
+def parse_size(text):
+    """
+    Parse a frame size like 1280x1280.
+
+    Args:
+        text (str): The width and height separated by an x.
+
+    Returns:
+        tuple: The width and height.
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is not a width and a height.
+    """
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid size: {text}") from error
+    return (width, height)
+
+
+def parse_lod(text):
+    """
+    Parse a level of detail interval, a positive integer or "auto".
+
+    Args:
+        text (str): The interval.
+
+    Returns:
+        int: The interval, or "auto".
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is neither "auto" nor a positive integer.
+    """
+    if text == "auto":
+        return text
+    try:
+        interval = int(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid level of detail: {text}") from error
+    if not 1 <= interval <= constants.MAX_LOD_INTERVAL:
+        raise argparse.ArgumentTypeError(
+            f"the level of detail must be between 1 and {constants.MAX_LOD_INTERVAL}"
+        )
+    return interval
+
+
+def add_capture_arguments(parser, capture_dir=None):
+    """
+    Add the arguments setting how the rendered frames are captured.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+        capture_dir (str): The default capture directory (default: None, no capture).
+    """
+    parser.add_argument(
+        "--capture-dir",
+        default=capture_dir,
+        help="directory to capture the rendered frames into",
+    )
+    parser.add_argument(
+        "--capture-format",
+        choices=constants.CAPTURE_FORMATS,
+        default="png",
+        help="png for a PNG file per frame, or a video format encoded by FFmpeg",
+    )
+    parser.add_argument(
+        "--capture-size",
+        type=parse_size,
+        default=None,
+        help="size of the captured frames like 1280x1280 (default: the window size)",
+    )
+
+
+def add_match_arguments(parser):
+    """
+    Add the arguments shared by every command running matches.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument("--speed", type=int, default=2, help="speed of the sprites")
+    parser.add_argument(
+        "--group-size", type=int, default=30, help="number of sprites in each group"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="seed of the first match"
+    )
+    parser.add_argument(
+        "--max-steps", type=int, default=None, help="step limit of a match"
+    )
+    add_world_arguments(parser)
+
+
+def add_endgame_argument(parser):
+    """
+    Add the argument setting how matches whose winner is already decided are handled.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the argument to.
+    """
+    parser.add_argument(
+        "--endgame",
+        choices=constants.ENDGAME_MODES,
+        default="play",
+        help="play decided matches to the end, stop them and report the winner (decide), "
+        "or also estimate the length of the match (estimate)",
+    )
+
+
+def add_world_arguments(parser):
+    """
+    Add the arguments setting the world and the rules of the matches.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        "--world-width",
+        type=int,
+        default=constants.WORLD_WIDTH,
+        help="width of the simulated world",
+    )
+    parser.add_argument(
+        "--world-height",
+        type=int,
+        default=constants.WORLD_HEIGHT,
+        help="height of the simulated world",
+    )
+    parser.add_argument(
+        "--rules",
+        choices=RULES,
+        default=DEFAULT_RULES,
+        help="species and who eats whom",
+    )
+
+
+def run_command(args):
+    """
+    Run matches one after the other and print each result as a JSON line.
+    Match `i` is seeded with `seed + i`, so any match can be replayed on its own.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+    """
+    from src.simulation.headless import run_match
+
+    for match in range(args.matches):
+        seed = args.seed + match if args.seed is not None else None
+        result = run_match(
+            args.speed,
+            args.group_size,
+            seed,
+            args.max_steps,
+            args.record_dir,
+            args.world_width,
+            args.world_height,
+            RULES[args.rules],
+            args.timeseries_dir,
+            args.sample_interval,
+            args.snapshot_dir,
+            args.snapshot_steps,
+            args.endgame,
+        )
+        print(json.dumps(result), flush=True)
+
+
+def branch_command(args):
+    """
+    Run continuations of a snapshot one after the other and print each result as a JSON line.
+    Branch `i` is seeded with `seed + i`, without a seed the match continues exactly like it did.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+    """
+    from src.simulation.headless import run_branch
+    from src.simulation.snapshot import load_snapshot
+
+    if args.seed is None and args.branches > 1:
+        sys.exit("branches without a seed would all be the same, give a --seed")
+    snapshot = load_snapshot(args.snapshot)
+    for branch in range(args.branches):
+        seed = args.seed + branch if args.seed is not None else None
+        result = run_branch(snapshot, seed, args.max_steps, args.endgame)
+        print(json.dumps(result), flush=True)
+
+
+def render_command(args):
+    """
+    Render a match off-screen, capture its frames and print its result as JSON.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+    """
+    # Pygame is only needed for rendering, the other commands run without it
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    from src.entities.offscreen import render_match
+
+    result = render_match(
+        args.speed,
+        args.group_size,
+        args.capture_dir,
+        seed=args.seed,
+        max_steps=args.max_steps,
+        world_width=args.world_width,
+        world_height=args.world_height,
+        rules=RULES[args.rules],
+        capture_format=args.capture_format,
+        capture_size=args.capture_size,
+        frame_interval=args.frame_interval,
+    )
+    print(json.dumps(result))
+
+
+def tournament_command(args):
+    """
+    Run a tournament on a process pool and print its summary as JSON.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+    """
+    from src.simulation.tournament import run_tournament
+
+    summary = run_tournament(
+        args.speed,
+        args.group_size,
+        args.matches,
+        seed=args.seed,
+        max_steps=args.max_steps,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        world_width=args.world_width,
+        world_height=args.world_height,
+        rules=RULES[args.rules],
+        endgame=args.endgame,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+def sweep_command(args):
+    """
+    Run the matches of a sweep missing from the cache and print the table of its grid cells.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+    """
+    from src.simulation.sweep import run_sweep
+
+    seeds = [] if args.report else list(range(args.seed, args.seed + args.seeds))
+    try:
+        rows = run_sweep(
+            args.cache,
+            args.speeds,
+            args.group_sizes,
+            seeds,
+            max_steps=args.max_steps,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            world_width=args.world_width,
+            world_height=args.world_height,
+            rules=args.rules,
+            endgame=args.endgame,
+            progress=print_progress,
+        )
+    except KeyboardInterrupt:
+        print(f"\nInterrupted, the finished matches are cached in {args.cache}", file=sys.stderr)
+        sys.exit(130)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    names = RULES[args.rules].names
+    print(
+        f"{'speed':>6}{'size':>6}{'matches':>9}"
+        + "".join(f"{name[:9]:>10}" for name in names)
+        + f"{'unfinished':>11}{'mean steps':>11}{'max steps':>10}"
+        + (f"{'estimated':>10}" if args.endgame == "estimate" else "")
+    )
+    for row in rows:
+        print(
+            f"{row['speed']:>6}{row['group_size']:>6}{row['matches']:>9}"
+            + "".join(f"{row['win_rates'][name]:>10.3f}" for name in names)
+            + f"{row['unfinished']:>11}{row['mean_steps']:>11.1f}{row['max_steps']:>10}"
+            + (
+                f"{row['mean_estimated_steps'] or 0:>10.1f}" if args.endgame == "estimate" else ""
+            )
+        )
+
+
+def print_progress(finished, missing):
+    """
+    Print the progress of a sweep on the standard error.
+
+    Args:
+        finished (int): The number of matches finished so far.
+        missing (int): The number of matches the sweep runs.
+    """
+    print(f"\r{finished}/{missing} matches", end="", file=sys.stderr, flush=True)
+    if finished == missing:
+        print(file=sys.stderr)
@@ -0,0 +1,147 @@
+"""
+This module defines the `Camera` class, which maps the simulated world onto the game window.
+
+The camera shows a rectangle of the world, its viewport, scaled by its zoom level. It converts world
+coordinates to screen coordinates and tells which sprites are inside the viewport, so only those
+have to be drawn. At zoom 1 with the default world size, world and screen coordinates are the same.
+"""
+import numpy as np
+from src.utils import constants
+
+
+class Camera:
+    """
+    A class for panning and zooming the view of the world.
+    """
+
+    def __init__(self, world_width, world_height, view_width, view_height):
+        """
+        Initialize a `Camera` object showing the whole world.
+
+        Args:
+            world_width (int): The width of the world.
+            world_height (int): The height of the world.
+            view_width (int): The width of the area of the window showing the world.
+            view_height (int): The height of the area of the window showing the world.
+        """
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = view_width
+        self.view_height = view_height
+        # Zoom showing the whole world, never zoomed in by default
+        self.min_zoom = min(1, view_width / world_width, view_height / world_height)
+        self.zoom = self.min_zoom  # Screen pixels per world pixel
+        self.x = 0.0  # World coordinates of the top left corner of the viewport
+        self.y = 0.0
+        self.clamp()
+
+    def get_sprite_size(self):
+        """
+        Get the size of a sprite on the screen.
+
+        Returns:
+            int: The side length of a sprite in screen pixels, at least 1.
+        """
+        return max(1, round(constants.SPRITE_SIZE * self.zoom))
+
+    def is_density_view(self):
+        """
+        Check if the camera is zoomed out too far to draw single sprites.
+
+        Returns:
+            bool: Whether the sprites should be drawn as a density map.
+        """
+        return self.zoom < constants.DENSITY_ZOOM
+
+    def to_screen(self, x, y):
+        """
+        Convert world coordinates to screen coordinates.
+
+        Args:
+            x (numpy.ndarray): The x coordinates in the world.
+            y (numpy.ndarray): The y coordinates in the world.
+
+        Returns:
+            tuple: The x and y coordinates on the screen, rounded to whole pixels.
+        """
+        return (
+            np.floor((x - self.x) * self.zoom).astype(int),
+            np.floor((y - self.y) * self.zoom).astype(int),
+        )
+
+    def get_visible(self, x, y):
+        """
+        Find the sprites overlapping the viewport.
+
+        Args:
+            x (numpy.ndarray): The x coordinates of the sprites in the world.
+            y (numpy.ndarray): The y coordinates of the sprites in the world.
+
+        Returns:
+            numpy.ndarray: The indices of the visible sprites.
+        """
+        size = constants.SPRITE_SIZE
+        right = self.x + self.view_width / self.zoom
+        bottom = self.y + self.view_height / self.zoom
+        return np.flatnonzero(
+            (x + size > self.x) & (x < right) & (y + size > self.y) & (y < bottom)
+        )
+
+    def pan(self, dx, dy):
+        """
+        Move the viewport by a distance on the screen.
+
+        Args:
+            dx (float): The horizontal distance in screen pixels.
+            dy (float): The vertical distance in screen pixels.
+        """
+        self.x -= dx / self.zoom
+        self.y -= dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, factor, screen_x, screen_y):
+        """
+        Zoom in or out while keeping the world point under a screen position in place.
+
+        Args:
+            factor (float): The zoom multiplier, above 1 to zoom in.
+            screen_x (float): The x coordinate of the fixed point on the screen.
+            screen_y (float): The y coordinate of the fixed point on the screen.
+        """
+        world_x = self.x + screen_x / self.zoom
+        world_y = self.y + screen_y / self.zoom
+        self.zoom = min(max(self.zoom * factor, self.min_zoom), constants.MAX_ZOOM)
+        self.x = world_x - screen_x / self.zoom
+        self.y = world_y - screen_y / self.zoom
+        self.clamp()
+
+    def reset(self):
+        """
+        Zoom out to show the whole world.
+        """
+        self.zoom = self.min_zoom
+        self.clamp()
+
+    def clamp(self):
+        """
+        Keep the viewport inside the world, or center the world if it is smaller than the viewport.
+        """
+        self.x = clamp_axis(self.x, self.world_width, self.view_width / self.zoom)
+        self.y = clamp_axis(self.y, self.world_height, self.view_height / self.zoom)
+
+
+def clamp_axis(position, world_extent, view_extent):
+    """
+    Clamp the position of the viewport along one axis.
+
+    Args:
+        position (float): The position of the viewport.
+        world_extent (float): The extent of the world along the axis.
+        view_extent (float): The extent of the viewport along the axis, in world pixels.
+
+    Returns:
+        float: The clamped position.
+    """
+    if view_extent >= world_extent:
+        return (world_extent - view_extent) / 2
+    return min(max(position, 0.0), world_extent - view_extent)
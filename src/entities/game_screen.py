@@ -2,12 +2,53 @@
 This module defines the `GameScreen` class, which represents the display of the simulation.
 It extends the `Screen` class.
 """
-import random
+import contextlib
+import time
+import numpy as np
 import pygame
+from src.entities.camera import Camera
 from src.entities.screen import Screen
-from src.entities.my_sprite import MySprite
 from src.entities.score_bar import ScoreBar
+from src.simulation.engine import Simulation
+from src.simulation.headless import create_seed, get_replay_path, get_timeseries_path
+from src.simulation.recorder import ReplayRecorder
+from src.simulation.snapshot import get_snapshot_path, take_snapshot
+from src.simulation.timeseries import PopulationSampler
+from src.simulation.worker import SimulationWorker
 from src.utils import constants
+from src.utils.assets import get_species_color, sprite_cache
+from src.utils.capture import FrameCapture, get_capture_path
+from src.utils.profiler import FrameProfiler, profile
+from src.utils.text_cache import text_cache
+
+# Phases shown in the performance overlay, the engine phases are part of "step"
+OVERLAY_PHASES = (
+    "events",
+    "step",
+    "lod",
+    "nearest",
+    "chase",
+    "evade",
+    "collision",
+    "sprites",
+    "hud",
+    "display",
+    "capture",
+    "frame",
+)
+OVERLAY_INTERVAL = 0.5  # Seconds between two refreshes of the overlay text
+
+# The automatic level of detail doubles the interval while the simulation takes more than this
+# fraction of the time, and halves it while it takes less than a quarter of it
+LOD_BUDGET = 0.75
+LOD_ADJUST_INTERVAL = 1.0  # Seconds between two changes of the automatic level of detail
+
+# Side length in screen pixels of a cell of the density map drawn when zoomed out
+DENSITY_CELL = 4
+
+# The sparkline of the group sizes fills the strip between the world and the score bars
+SPARKLINE_TOP = constants.RESOLUTION - constants.SCORE_BAR_MARGIN + 1
+SPARKLINE_HEIGHT = 13
 
 
 class GameScreen(Screen):
@@ -15,7 +56,28 @@ class GameScreen(Screen):
     A class for managing the game screen in a Rock, Paper, Scissors simulation.
     """
 
-    def __init__(self, screen, speed, group_size):
+    def __init__(
+        self,
+        screen,
+        speed,
+        group_size,
+        dirty_rendering=False,
+        seed=None,
+        record_dir=None,
+        profiler=None,
+        world_width=constants.WORLD_WIDTH,
+        world_height=constants.WORLD_HEIGHT,
+        rules=None,
+        timeseries_dir=None,
+        snapshot_dir=None,
+        capture_dir=None,
+        capture_format="png",
+        capture_size=None,
+        threaded=False,
+        lod=1,
+        target_refresh=1,
+        validate_targets=False,
+    ):
         """
         Initialize a `GameScreen` object.
 
@@ -23,31 +85,133 @@ class GameScreen(Screen):
             screen (pygame.Surface): The Pygame surface representing the game screen.
             speed (int): The speed of the sprites.
             group_size (int): The number of sprites in each contender group.
+            dirty_rendering (bool): Whether to redraw only the areas that changed (default: False).
+                Can be toggled during the game with the D key.
+            seed (int): The seed of the match's random generator (default: a fresh seed).
+            record_dir (str): The directory to record a replay of the match into (default: no replay).
+            profiler (FrameProfiler): The profiler timing the frames (default: a disabled profiler).
+                The P key toggles an overlay of its statistics and turns it on.
+            world_width (int): The width of the simulated world (default: constants.WORLD_WIDTH).
+            world_height (int): The height of the simulated world (default: constants.WORLD_HEIGHT).
+            rules (Rules): The species and who eats whom (default: rock, paper, scissors).
+            timeseries_dir (str): The directory to write the population time series of the match into
+                (default: the time series is only kept in memory for the sparkline).
+            snapshot_dir (str): The directory to save the snapshots taken with F5 into
+                (default: snapshots are only kept in memory).
+            capture_dir (str): The directory to capture the rendered frames of the match into
+                (default: no capture).
+            capture_format (str): "png" to save the frames as PNG files, or the extension of the
+                video file to encode them into (default: "png").
+            capture_size (tuple): The width and height of the captured frames
+                (default: the size of the screen).
+            threaded (bool): Whether to run the simulation on a worker thread while the frames
+                are rendered (default: False).
+            lod (int): The steps between two searches of the sprites far from any prey and hunter,
+                or "auto" to adapt it to the time the steps take (default: 1, every step).
+            target_refresh (int): The steps after which a sprite searches for its prey and hunter
+                again, even if it kept them (default: 1, every step, without keeping targets).
+            validate_targets (bool): Whether to compare the kept targets with an exact search
+                (default: False).
+
+        The simulation advances at a fixed rate of `constants.STEP_RATE` steps per second times the
+        fast-forward multiplier, which is changed with the arrow keys during the game. Rendering runs
+        at most at `constants.FPS`, frames are dropped when the simulation falls behind.
+
+        The world is shown through a camera, zoomed out to show the whole world at first. The mouse
+        wheel or the +/- keys zoom, dragging with the mouse pans and HOME zooms out again. Only the
+        sprites inside the viewport are drawn, as a density map when zoomed out far.
+
+        F5 takes a snapshot of the simulation and F9 goes back to the last one. The match continues
+        exactly like it did after the snapshot, or differently when SHIFT is held down with F9.
+        Every restore starts a new segment of the replay and the time series, a file of its own.
+
+        With `threaded`, a `SimulationWorker` runs the owed steps on its own thread and the frames
+        show the last step it finished, so a slow step does not hold back the events and the
+        rendering, and frames are never dropped.
+
+        With an automatic level of detail, the interval starts at 1 and is doubled, up to
+        `constants.MAX_LOD_INTERVAL`, while the steps take more than `LOD_BUDGET` of the time,
+        and halved again once they take less than a quarter of it.
         """
         super().__init__(screen)  # Initialize the parent class (Screen)
         self.screen = screen  # Pygame screen surface
         self.speed = speed  # Speed of sprite movement
         self.group_size = group_size  # Size of each group of sprites
-        self.rocks = pygame.sprite.Group()  # Group for rock sprites
-        self.papers = pygame.sprite.Group()  # Group for paper sprites
-        self.scissors = pygame.sprite.Group()  # Group for scissor sprites
-        self.sprite_groups = [
-            self.rocks,
-            self.papers,
-            self.scissors,
-        ]  # List of sprite groups
-
-        # Initialize score bars with the appropriate colors
-        self.rock_score = ScoreBar(self.screen, constants.ROCK_COLOR)
-        self.paper_score = ScoreBar(self.screen, constants.PAPER_COLOR)
-        self.scissors_score = ScoreBar(self.screen, constants.SCISSORS_COLOR)
-
-        self.winner_group = None  # Initialize the winner group as None
-
-        # Create initial sprites for rock, paper, and scissor groups
-        self.create_sprites("rock", self.rocks, self.papers, self.scissors)
-        self.create_sprites("paper", self.papers, self.scissors, self.rocks)
-        self.create_sprites("scissors", self.scissors, self.rocks, self.papers)
+        self.winner = None  # Initialize the winner as None
+
+        # Fixed timestep: steps owed to the simulation since the last frame
+        self.fast_forward = 0  # Index of the current multiplier in constants.FAST_FORWARD_RATES
+        self.step_debt = 0.0
+        self.last_frame_time = time.perf_counter()
+        self.dropped_frames = 0  # Frames skipped in a row
+        self.step_ms = 0.0  # Smoothed duration of a step in milliseconds, without a worker
+
+        # Dirty rendering clears and updates only the areas drawn in this and the last frame
+        self.dirty_rendering = dirty_rendering
+        self.full_redraw = True  # Redraw the whole screen in the next frame
+        self.cleared_rects = []  # Areas drawn in the last frame, cleared in this one
+        self.drawn_rects = []  # Areas drawn in this frame
+
+        # The simulation computes the sprites' behavior, the sprites only render it
+        self.seed = seed if seed is not None else create_seed()
+        self.simulation = Simulation(
+            speed,
+            group_size,
+            np.random.default_rng(self.seed),
+            world_width,
+            world_height,
+            rules,
+        )
+        self.auto_lod = lod == "auto"
+        self.simulation.lod_interval = 1 if self.auto_lod else lod
+        self.simulation.target_refresh = target_refresh
+        self.simulation.validate_targets = validate_targets
+        self.lod_time = time.perf_counter()  # Last change of the automatic level of detail
+        self.names = self.simulation.rules.names  # Name of every species
+        # Initialize a score bar for every species with its color
+        self.colors = [get_species_color(name) for name in self.names]
+        self.score_bars = [ScoreBar(self.screen, color) for color in self.colors]
+        self.record_dir = record_dir
+        self.timeseries_dir = timeseries_dir
+        self.segment = 0  # Number of snapshot restores, each one starts new replay and time series
+        self.recorder = None
+        self.sampler = None
+        self.start_segment()
+        # Rendered frames are copied to a capture, which encodes them on its own threads
+        self.capture = None
+        self.captured_step = None  # Step shown in the last captured frame
+        if capture_dir is not None:
+            self.capture = FrameCapture(
+                get_capture_path(capture_dir, self.seed, capture_format), capture_size
+            )
+        self.snapshot = None  # Last snapshot taken with F5
+        self.snapshot_dir = snapshot_dir
+
+        # The camera maps the world onto the area of the window above the score bars
+        self.viewport = pygame.Rect(
+            0, 0, constants.RESOLUTION, constants.RESOLUTION - constants.SCORE_BAR_MARGIN
+        )
+        self.camera = Camera(
+            world_width, world_height, self.viewport.width, self.viewport.height
+        )
+        self.images = []  # Shared image of every species at the current sprite size
+        self.image_size = None
+
+        # Performance overlay, its text is refreshed every OVERLAY_INTERVAL seconds to stay readable
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.show_overlay = False
+        self.overlay_lines = []
+        self.overlay_time = 0.0
+
+        # State drawn in the frame, the simulation itself or the front buffer of the worker
+        self.state = self.simulation
+        self.worker = None
+        if threaded:
+            # The profiler is not thread safe, the worker times the steps itself
+            self.worker = SimulationWorker(self.simulation, self.record_step)
+            self.state = self.worker.front
+        else:
+            self.simulation.profiler = self.profiler
 
     def get_winner(self):
         """
@@ -55,65 +219,415 @@ class GameScreen(Screen):
         String used in `Main` class, for initalizing `GameOverScreen` object.
 
         Returns:
-            str: A string representing the winning sprite type (rock, paper, or scissors).
+            str: A string representing the winning sprite type, the name of its species.
+        """
+        return self.winner
+
+    def get_step_rate(self):
+        """
+        Get the current number of simulation steps per second.
+
+        Returns:
+            float: The step rate including the fast-forward multiplier.
+        """
+        return constants.STEP_RATE * constants.FAST_FORWARD_RATES[self.fast_forward]
+
+    def main_loop(self):
+        """
+        Main loop of the game screen, called once per frame.
+
+        This method performs the following tasks in order:
+        1. Checks for user inputs.
+        2. Advances the simulation by the steps owed since the last frame,
+           or requests them from the worker thread.
+        3. Renders the frame, unless the simulation is behind and the frame is dropped.
+        4. Limits framerate at `constants.FPS`.
+        Every phase is timed by the profiler while it is enabled.
+        """
+        self.click = False
+        self.profiler.start_frame()
+        with profile(self.profiler, "events"):
+            self.check_events()
+        if self.advance_simulation():
+            self.render_frame()
+        self.profiler.end_frame()
+        self.clock.tick(constants.FPS)
+
+    def advance_simulation(self):
+        """
+        Run the simulation steps owed since the last frame.
+
+        Steps are never skipped, so the outcome of a match does not depend on the frame rate.
+        If the steps do not fit into the time of a frame, the remaining ones are carried over
+        and the frame is not rendered, at most `constants.MAX_DROPPED_FRAMES` times in a row.
+
+        With a worker thread, the owed steps are requested from it instead and the frame shows
+        the last step it finished. While the worker is busy, frames without a newer step are
+        not rendered, at most `constants.MAX_DROPPED_FRAMES` times in a row.
+
+        Returns:
+            bool: Whether the frame should be rendered.
+        """
+        now = time.perf_counter()
+        frame_time = 1 / constants.FPS
+        # Owe at most one second of steps, so a long stall does not freeze the screen for long
+        self.step_debt = min(
+            self.step_debt + (now - self.last_frame_time) * self.get_step_rate(),
+            self.get_step_rate(),
+        )
+        self.last_frame_time = now
+        if self.auto_lod and now - self.lod_time >= LOD_ADJUST_INTERVAL:
+            self.adjust_lod()
+            self.lod_time = now
+        if self.worker is not None:
+            changed = self.request_steps()
+            # Redrawing the same state would only take time from the worker
+            busy = self.is_running and self.worker.get_requested() > 0
+            if not changed and busy and self.dropped_frames < constants.MAX_DROPPED_FRAMES:
+                self.dropped_frames += 1
+                return False
+            self.dropped_frames = 0
+            return True
+
+        while self.step_debt >= 1 and self.is_running:
+            self.run_step()
+            if not self.is_running:
+                break
+            self.step_debt -= 1
+            if time.perf_counter() - now > frame_time:
+                break
+
+        behind = self.step_debt >= 1 and self.is_running
+        if behind and self.dropped_frames < constants.MAX_DROPPED_FRAMES:
+            self.dropped_frames += 1
+            return False
+        self.dropped_frames = 0
+        return True
+
+    def request_steps(self):
+        """
+        Show the last step the worker finished and request the owed steps from it,
+        or stop the screen if the match is over.
+
+        Returns:
+            bool: Whether the worker finished a step since the last frame.
+        """
+        changed = self.worker.swap()
+        self.state = self.worker.front
+        self.check_winner()
+        if not self.is_running:
+            return changed
+        # Keep at most one second of steps queued, like the step debt
+        owed = min(int(self.step_debt), int(self.get_step_rate()) - self.worker.get_requested())
+        if owed > 0:
+            self.worker.request(owed)
+        self.step_debt -= int(self.step_debt)
+        return changed
+
+    def run_step(self):
+        """
+        Run one simulation step and record it, or stop the screen if the match is over.
+        """
+        self.check_winner()
+        if not self.is_running:
+            return
+        start = time.perf_counter_ns()
+        with profile(self.profiler, "step"):
+            self.simulation.step()
+        self.step_ms += ((time.perf_counter_ns() - start) / 1e6 - self.step_ms) * 0.1
+        self.record_step()
+
+    def adjust_lod(self):
+        """
+        Double the level of detail interval if the steps take more than `LOD_BUDGET` of the time
+        at the current step rate, or halve it if they take less than a quarter of it.
+        """
+        step_ms = self.worker.step_ms if self.worker is not None else self.step_ms
+        load = step_ms * self.get_step_rate() / 1000
+        interval = self.simulation.lod_interval
+        if load > LOD_BUDGET:
+            interval = min(interval * 2, constants.MAX_LOD_INTERVAL)
+        elif load < LOD_BUDGET / 4:
+            interval = max(interval // 2, 1)
+        if interval != self.simulation.lod_interval:
+            with self.pause_simulation():
+                self.simulation.lod_interval = interval
+
+    def start_segment(self):
+        """
+        Start recording the replay, if the match is recorded, and sampling the population from the
+        current step on, into new files named after the segment.
+        """
+        if self.record_dir is not None:
+            self.recorder = ReplayRecorder(
+                get_replay_path(self.record_dir, self.seed, self.segment),
+                self.simulation,
+                self.seed,
+            )
+        # The last samples of the group sizes are drawn as a sparkline above the score bars
+        timeseries_path = None
+        if self.timeseries_dir is not None:
+            timeseries_path = get_timeseries_path(self.timeseries_dir, self.seed, self.segment)
+        self.sampler = PopulationSampler(
+            self.simulation, timeseries_path, history=constants.RESOLUTION
+        )
+
+    def close_segment(self):
+        """
+        Finish the replay file, if the match is recorded, and the time series file, if the time
+        series is written.
+        """
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        self.sampler.close()
+
+    def record_step(self):
+        """
+        Record the last step into the replay, if the match is recorded, and sample its population.
+        Called on the worker thread when the simulation runs on one.
+        """
+        if self.recorder is not None:
+            self.recorder.record()
+        self.sampler.sample()
+
+    def pause_simulation(self):
+        """
+        Get a context in which the simulation can be changed, the worker does not step it meanwhile.
+
+        Returns:
+            contextlib.AbstractContextManager: The lock of the worker, or a context doing nothing.
+        """
+        if self.worker is None:
+            return contextlib.nullcontext()
+        return self.worker.pause()
+
+    def render_frame(self):
+        """
+        Render the current state of the simulation and capture the frame if a capture is set.
         """
-        return self.winner_group.sprites()[0].get_sprite_text()
+        with profile(self.profiler, "sprites"):
+            self.blit_background()
+        self.sub_loop()
+        with profile(self.profiler, "display"):
+            self.update_display()
+        if self.capture is not None:
+            with profile(self.profiler, "capture"):
+                self.capture.capture(self.screen)
+            self.captured_step = self.state.steps
+
+    def stop(self):
+        """
+        Stop the main loop of the screen, finish the replay file if the match is recorded,
+        the time series file if the time series is written and the capture if frames are captured.
+        The capture gets a last frame of the final state if it was not captured yet, since the
+        screen stops as soon as it sees the winner, before rendering it.
+        """
+        super().stop()
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+        self.close_segment()
+        if self.capture is not None:
+            if self.captured_step != self.state.steps:
+                self.render_frame()
+            self.capture.close()
+            self.capture = None
 
     def sub_loop(self):
         """
         Manage the game screen's content and interactions.
         """
-        self.update_sprites()
-        self.draw_score_bars()
+        with profile(self.profiler, "sprites"):
+            self.update_sprites()
+        with profile(self.profiler, "hud"):
+            self.draw_sparkline()
+            self.draw_score_bars()
+            self.draw_fast_forward()
+            if self.show_overlay:
+                self.draw_overlay()
 
     def update_sprites(self):
         """
-        Update the positions of all sprites and render them on the screen.
+        Render the sprites inside the viewport at the positions of the last simulation step.
+
+        The sprites are drawn straight from the state arrays with the shared image of their
+        species, so sprites that were eaten in the last step are simply drawn with their new image.
+        Groups are drawn one after the other, rocks first, like the sprite groups used to be.
+        """
+        state = self.state
+        visible = self.camera.get_visible(state.x, state.y)
+        self.screen.set_clip(self.viewport)
+        if self.camera.is_density_view():
+            self.draw_density(visible)
+        else:
+            visible = visible[np.argsort(state.species[visible], kind="stable")]
+            x, y = self.camera.to_screen(state.x[visible], state.y[visible])
+            images = self.get_images()
+            self.drawn_rects.extend(
+                self.screen.blits(
+                    [
+                        (images[species], (left, top))
+                        for left, top, species in zip(
+                            x.tolist(), y.tolist(), state.species[visible].tolist()
+                        )
+                    ]
+                )
+            )
+        self.screen.set_clip(None)
+
+    def get_images(self):
+        """
+        Get the shared image of every species at the sprite size of the current zoom level.
+        The images of the previous size are removed from the cache when the size changes.
 
-        This method iterates through the sprite groups, checks if a group has won,
-        and updates and renders individual sprites.
+        Returns:
+            list: The image of every species.
         """
-        for group in self.sprite_groups:
-            self.check_winner(group)
-            for sprite in group:
-                sprite.update_sprite()
-                sprite.blit_sprite()
+        size = self.camera.get_sprite_size()
+        if size != self.image_size:
+            if self.image_size not in (None, constants.SPRITE_SIZE):
+                sprite_cache.evict(self.image_size)
+            self.images = [sprite_cache.get_image(name, size) for name in self.names]
+            self.image_size = size
+        return self.images
 
-    def check_winner(self, group):
+    def draw_density(self, visible):
         """
-        This method determines the winning sprite group when it reaches the required size.
+        Draw the visible sprites as a map of square cells, colored by the groups inside each cell
+        and shaded by their number relative to the most crowded cell.
 
         Args:
-            group (pygame.sprite.Group): The sprite group to be checked for victory.
+            visible (numpy.ndarray): The indices of the sprites inside the viewport.
         """
-        if len(group) == self.group_size * 3:
-            self.winner_group = group
-            self.current_screen = "game_over"
-            self.stop()
+        state = self.state
+        columns = -(-self.viewport.width // DENSITY_CELL)
+        rows = -(-self.viewport.height // DENSITY_CELL)
+        center = constants.SPRITE_SIZE / 2
+        x, y = self.camera.to_screen(
+            state.x[visible] + center, state.y[visible] + center
+        )
+        column = np.clip(x // DENSITY_CELL, 0, columns - 1)
+        row = np.clip(y // DENSITY_CELL, 0, rows - 1)
+        keys = (state.species[visible] * columns + column) * rows + row
+        counts = np.bincount(keys, minlength=len(self.names) * columns * rows)
+        counts = counts.reshape(len(self.names), columns, rows)
 
-    def create_sprites(self, image, own_group, hunter_group, prey_group):
+        total = counts.sum(axis=0)
+        mix = np.einsum("scr,sk->crk", counts, np.array(self.colors)) / np.maximum(total, 1)[..., None]
+        # The square root keeps sparsely populated cells visible next to crowded ones
+        shade = np.sqrt(total / max(total.max(), 1))[..., None]
+        rgb = np.array(constants.BGCOLOR) * (1 - shade) + mix * shade
+
+        surface = pygame.surfarray.make_surface(rgb.astype(np.uint8))
+        surface = pygame.transform.scale(
+            surface, (columns * DENSITY_CELL, rows * DENSITY_CELL)
+        )
+        self.drawn_rects.append(self.screen.blit(surface, self.viewport))
+
+    def handle_event(self, event):
         """
-        This method is called to initialize the game with a set of sprites.
+        Toggle dirty rendering with the D key, change the fast-forward multiplier with the arrow keys,
+        toggle the performance overlay with the P key, take and restore snapshots with F5 and F9
+        and move the camera.
 
         Args:
-            image (str): The type of sprite to create (rock, paper, or scissors).
-            own_group (pygame.sprite.Group): The sprite group to which the new sprites will belong.
-            hunter_group (pygame.sprite.Group): The group of sprites that the new sprites will target.
-            prey_group (pygame.sprite.Group): The group of sprites that the new sprites will avoid.
-        """
-        for _ in range(self.group_size):
-            random_x = random.randint(10, 490)
-            random_y = random.randint(10, 490)
-            sprite = MySprite(
-                self.screen,
-                image,
-                (random_x, random_y),
-                self.speed,
-                own_group,
-                hunter_group,
-                prey_group,
+            event (pygame.event.Event): The event to handle.
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            self.camera.zoom_at(constants.ZOOM_STEP**event.y, *pygame.mouse.get_pos())
+        if event.type == pygame.MOUSEMOTION and event.buttons[0]:
+            self.camera.pan(*event.rel)
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_d:
+            self.dirty_rendering = not self.dirty_rendering
+            self.full_redraw = True
+        if event.key in (pygame.K_RIGHT, pygame.K_UP):
+            self.fast_forward = min(
+                self.fast_forward + 1, len(constants.FAST_FORWARD_RATES) - 1
             )
-            own_group.add(sprite)
+        if event.key in (pygame.K_LEFT, pygame.K_DOWN):
+            self.fast_forward = max(self.fast_forward - 1, 0)
+        if event.key == pygame.K_p:
+            self.show_overlay = not self.show_overlay
+            self.profiler.enabled = True
+            self.overlay_time = 0.0
+            self.full_redraw = True
+        if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.camera.zoom_at(constants.ZOOM_STEP, *self.viewport.center)
+        if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.camera.zoom_at(1 / constants.ZOOM_STEP, *self.viewport.center)
+        if event.key == pygame.K_HOME:
+            self.camera.reset()
+        if event.key == pygame.K_F5:
+            self.take_snapshot()
+        if event.key == pygame.K_F9 and self.snapshot is not None:
+            self.restore_snapshot(branch=bool(event.mod & pygame.KMOD_SHIFT))
+
+    def take_snapshot(self):
+        """
+        Take a snapshot of the simulation, and save it if a snapshot directory is given.
+        """
+        with self.pause_simulation():
+            self.snapshot = take_snapshot(self.simulation, self.seed)
+        if self.snapshot_dir is not None:
+            self.snapshot.save(
+                get_snapshot_path(self.snapshot_dir, self.seed, self.snapshot.steps)
+            )
+
+    def restore_snapshot(self, branch=False):
+        """
+        Go back to the last snapshot. The sprites are views of the simulation arrays,
+        which are restored in place, so only the screen has to be redrawn. The replay and the
+        time series go on in new files from the restored step.
+
+        Args:
+            branch (bool): Whether to continue with a fresh random generator instead of
+                continuing like the match did after the snapshot (default: False).
+        """
+        rng = np.random.default_rng(create_seed()) if branch else None
+        with self.pause_simulation():
+            self.close_segment()
+            self.snapshot.restore(self.simulation, rng)
+            self.segment += 1
+            self.start_segment()
+            if self.worker is not None:
+                self.worker.publish()
+        self.step_debt = 0.0
+        self.full_redraw = True
+
+    def blit_background(self):
+        """
+        Clear the screen, or with dirty rendering only the areas drawn in the last frame.
+        """
+        self.cleared_rects = self.drawn_rects
+        self.drawn_rects = []
+        if not self.dirty_rendering or self.full_redraw:
+            super().blit_background()
+            return
+        for rect in self.cleared_rects:
+            self.screen.fill(constants.BGCOLOR, rect)
+
+    def update_display(self):
+        """
+        Update the display, or with dirty rendering only the areas cleared or drawn in this frame.
+        """
+        if not self.dirty_rendering or self.full_redraw:
+            super().update_display()
+            self.full_redraw = False
+            return
+        pygame.display.update(self.cleared_rects + self.drawn_rects)
+
+    def check_winner(self):
+        """
+        This method determines the winning sprite group when it converted every other sprite.
+        """
+        winner = self.state.get_winner()
+        if winner is not None:
+            self.winner = self.names[winner]
+            self.current_screen = "game_over"
+            self.stop()
 
     def draw_score_bars(self):
         """
@@ -123,11 +637,104 @@ class GameScreen(Screen):
         and then draws them on the game screen. The score bars represent the progress of each sprite group.
 
         """
-        multipilier = constants.RESOLUTION / (self.group_size * 3)
+        multipilier = constants.RESOLUTION / len(self.state)
+
+        start = 0
+        for score_bar, count in zip(self.score_bars[:-1], self.state.get_counts()):
+            score_bar.draw(start, count * multipilier)
+            start += count * multipilier
+        self.score_bars[-1].draw(start - 2, constants.RESOLUTION)
+        self.drawn_rects.append(
+            pygame.Rect(
+                0,
+                constants.RESOLUTION - constants.SCORE_BAR_MARGIN,
+                constants.RESOLUTION,
+                constants.SCORE_BAR_MARGIN,
+            )
+        )
+
+    def draw_sparkline(self):
+        """
+        Draw the recent group sizes as one line per species above the score bars,
+        one pixel per sample with the latest sample on the right.
+        """
+        # The worker thread adds the samples while holding its lock
+        lock = self.worker.lock if self.worker is not None else contextlib.nullcontext()
+        with lock:
+            counts = self.sampler.get_counts().copy()
+        if len(counts) < 2:
+            return
+        left = constants.RESOLUTION - len(counts)
+        heights = counts / len(self.state) * (SPARKLINE_HEIGHT - 1)
+        bottom = SPARKLINE_TOP + SPARKLINE_HEIGHT - 1
+        for color, height in zip(self.colors, heights.T):
+            points = np.column_stack((np.arange(left, constants.RESOLUTION), bottom - height))
+            pygame.draw.lines(self.screen, color, False, points.tolist())
+
+    def draw_fast_forward(self):
+        """
+        Draw the fast-forward multiplier in the top right corner while fast-forwarding.
+        """
+        rate = constants.FAST_FORWARD_RATES[self.fast_forward]
+        if rate == 1:
+            return
+        image = text_cache.render(f"{rate}x", 10, constants.TEXTCOLOR)
+        rect = image.get_rect(topright=(constants.RESOLUTION - 5, 5))
+        self.drawn_rects.append(self.screen.blit(image, rect))
+
+    def draw_overlay(self):
+        """
+        Draw the frame rate, the step rate, the group sizes and the time of every phase
+        in the top left corner.
+        """
+        now = time.perf_counter()
+        if now - self.overlay_time >= OVERLAY_INTERVAL:
+            self.overlay_time = now
+            self.overlay_lines = self.get_overlay_lines()
+        top = 5
+        for line in self.overlay_lines:
+            image = text_cache.render(line, 8, constants.TEXTCOLOR)
+            self.drawn_rects.append(self.screen.blit(image, (5, top)))
+            top += image.get_height() + 2
 
-        len_rocks = len(self.rocks) * multipilier
-        len_papers = len(self.papers) * multipilier
+    def get_overlay_lines(self):
+        """
+        Get the text of the performance overlay.
 
-        self.rock_score.draw(0, len_rocks)
-        self.paper_score.draw(len_rocks, len_papers)
-        self.scissors_score.draw(len_rocks + len_papers - 2, constants.RESOLUTION)
+        Returns:
+            list: The lines of the overlay.
+        """
+        stats = self.profiler.get_stats()
+        step = stats.get("step", {}).get("per_call_ms", 0.0)
+        if self.worker is not None:
+            step = self.worker.step_ms
+        counts = self.state.get_counts()
+        lines = [
+            f"FPS {self.profiler.get_fps():.1f} STEP {step:.2f} MS",
+            " ".join(f"{name.upper()} {count}" for name, count in zip(self.names, counts)),
+        ]
+        if self.auto_lod or self.simulation.lod_interval > 1:
+            lod = self.simulation.get_lod_stats()
+            lines.append(
+                f"LOD {self.simulation.lod_interval} SKIPPED {lod['skipped']:.0%}"
+                f" ERROR {lod['error']:.2f} PX"
+            )
+        if self.simulation.target_refresh > 1:
+            targets = self.simulation.get_target_stats()
+            line = f"TARGETS KEPT {targets['hits']:.0%}"
+            if self.simulation.validate_targets:
+                line += f" WRONG {targets['wrong']:.0%} +{targets['extra_distance']:.1f} PX"
+            lines.append(line)
+        texts = text_cache.get_stats()
+        lookups = texts["text_hits"] + texts["text_misses"]
+        lines.append(
+            f"TEXTS CACHED {texts['text_hits'] / max(lookups, 1):.0%}"
+            f" FONTS LOADED {texts['font_misses']}"
+        )
+        lines.append("PHASE MEAN/P99 MS PER FRAME")
+        for name in OVERLAY_PHASES:
+            if name in stats:
+                lines.append(
+                    f"{name.upper()} {stats[name]['mean_ms']:.2f}/{stats[name]['p99_ms']:.2f}"
+                )
+        return lines
@@ -0,0 +1,92 @@
+"""
+This module renders matches off-screen and captures their frames, without a window.
+
+The `GameScreen` draws to a dummy SDL video driver and renders a frame after every few steps,
+as fast as the CPU and the encoders allow. The capture blocks instead of dropping frames when
+the encoders fall behind, so the output holds every rendered frame.
+"""
+import os
+import pygame
+from src.entities.game_screen import GameScreen
+from src.simulation.headless import get_result
+from src.utils import constants
+
+
+def render_match(
+    speed,
+    group_size,
+    capture_dir,
+    seed=None,
+    max_steps=None,
+    world_width=constants.WORLD_WIDTH,
+    world_height=constants.WORLD_HEIGHT,
+    rules=None,
+    capture_format="png",
+    capture_size=None,
+    frame_interval=1,
+):
+    """
+    Render a single match off-screen until one group wins or the step limit is reached.
+
+    Args:
+        speed (int): The speed of the sprites.
+        group_size (int): The number of sprites in each contender group.
+        capture_dir (str): The directory to capture the frames of the match into.
+        seed (int): The seed of the match's random generator (default: a fresh seed).
+        max_steps (int): The maximum number of steps to simulate (default: no limit).
+        world_width (int): The width of the simulated world (default: constants.WORLD_WIDTH).
+        world_height (int): The height of the simulated world (default: constants.WORLD_HEIGHT).
+        rules (Rules): The species and who eats whom (default: rock, paper, scissors).
+        capture_format (str): "png" to save the frames as PNG files, or the extension of the
+            video file to encode them into (default: "png").
+        capture_size (tuple): The width and height of the captured frames
+            (default: the size of the window).
+        frame_interval (int): The number of steps between two rendered frames (default: 1).
+
+    Returns:
+        dict: The result of the match like `run_match` returns it, and the number of captured frames.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((constants.RESOLUTION, constants.RESOLUTION))
+    game = GameScreen(
+        screen,
+        speed,
+        group_size,
+        seed=seed,
+        world_width=world_width,
+        world_height=world_height,
+        rules=rules,
+        capture_dir=capture_dir,
+        capture_format=capture_format,
+        capture_size=capture_size,
+    )
+    capture = game.capture
+    capture.block = True
+
+    game.render_frame()
+    while not is_over(game.simulation, max_steps):
+        for _ in range(frame_interval):
+            game.run_step()
+            if is_over(game.simulation, max_steps):
+                break
+        game.render_frame()
+    game.stop()
+
+    result = get_result(game.simulation, game.seed)
+    result["frames"] = capture.captured
+    return result
+
+
+def is_over(simulation, max_steps):
+    """
+    Check whether a rendered match is over.
+
+    Args:
+        simulation (Simulation): The simulation of the match.
+        max_steps (int): The maximum number of steps to simulate, None for no limit.
+
+    Returns:
+        bool: Whether a group won or the step limit is reached.
+    """
+    return simulation.get_winner() is not None or simulation.steps == max_steps
@@ -0,0 +1,255 @@
+"""
+This module defines the `ReplayScreen` class, which plays back a recorded match.
+It extends the `Screen` class.
+
+The replay file is memory-mapped, so only the steps that are shown are ever read from disk.
+Controls:
+- SPACE: play or pause.
+- LEFT / RIGHT: one step back or forward, PAGE UP / PAGE DOWN: 100 steps.
+- HOME / END: jump to the first or the last step.
+- UP / DOWN: increase or decrease the playback rate.
+- Digits then ENTER: jump to the typed step.
+- Click or drag on the timeline: scrub to a step.
+- Mouse wheel: zoom, drag above the timeline: move around the world.
+- M: back to the main menu.
+"""
+import time
+import numpy as np
+import pygame
+from src.entities.camera import Camera
+from src.entities.screen import Screen
+from src.entities.score_bar import ScoreBar
+from src.simulation.recorder import ReplayReader
+from src.utils import constants
+from src.utils.assets import get_species_color, sprite_cache
+from src.utils.text_cache import text_cache
+
+# Playback rates, as multipliers of constants.STEP_RATE
+PLAYBACK_RATES = (0.25, 0.5, 1, 2, 5, 10, 20, 50)
+
+# Vertical extent of the timeline, between the sprite area and the score bars
+TIMELINE_TOP = constants.RESOLUTION - constants.SCORE_BAR_MARGIN + 3
+TIMELINE_HEIGHT = 9
+
+
+class ReplayScreen(Screen):
+    """
+    A class for playing back, pausing and scrubbing through a recorded match.
+    """
+
+    def __init__(self, screen, path):
+        """
+        Initialize a `ReplayScreen` object.
+
+        Args:
+            screen (pygame.Surface): The Pygame surface representing the game screen.
+            path (str): The path of the replay file.
+        """
+        super().__init__(screen)
+        self.current_screen = "replay"
+        self.reader = ReplayReader(path)
+        header = self.reader.header
+        names = header["names"]
+        self.names = names
+        self.images = None  # Image of every species at the sprite size of the current zoom level
+        self.image_size = None
+        # The camera maps the recorded world onto the area of the window above the timeline
+        self.viewport = pygame.Rect(
+            0, 0, constants.RESOLUTION, constants.RESOLUTION - constants.SCORE_BAR_MARGIN
+        )
+        self.camera = Camera(
+            header["width"], header["height"], self.viewport.width, self.viewport.height
+        )
+        self.score_bars = [
+            ScoreBar(self.screen, get_species_color(name)) for name in names
+        ]
+
+        self.position = 0.0  # Current step, fractional while playing slower than one step a frame
+        self.playing = True
+        self.rate = PLAYBACK_RATES.index(1)  # Index of the current playback rate
+        self.typed_step = ""  # Digits typed so far for a jump
+        self.last_frame_time = time.perf_counter()
+
+    def get_step(self):
+        """
+        Get the step currently shown.
+
+        Returns:
+            int: The current step.
+        """
+        return int(self.position)
+
+    def seek(self, step):
+        """
+        Jump to a step, clamped to the recorded steps.
+
+        Args:
+            step (float): The step to jump to.
+        """
+        self.position = float(min(max(step, 0), len(self.reader) - 1))
+
+    def handle_event(self, event):
+        """
+        Handle the playback controls and move the camera.
+
+        Args:
+            event (pygame.event.Event): The event to handle.
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            self.camera.zoom_at(constants.ZOOM_STEP**event.y, *pygame.mouse.get_pos())
+        if (
+            event.type == pygame.MOUSEMOTION
+            and event.buttons[0]
+            and self.viewport.collidepoint(event.pos)
+        ):
+            self.camera.pan(*event.rel)
+        if event.type != pygame.KEYDOWN:
+            return
+        match event.key:
+            case pygame.K_SPACE:
+                self.playing = not self.playing
+            case pygame.K_LEFT:
+                self.seek(self.get_step() - 1)
+            case pygame.K_RIGHT:
+                self.seek(self.get_step() + 1)
+            case pygame.K_PAGEUP:
+                self.seek(self.get_step() - 100)
+            case pygame.K_PAGEDOWN:
+                self.seek(self.get_step() + 100)
+            case pygame.K_HOME:
+                self.seek(0)
+            case pygame.K_END:
+                self.seek(len(self.reader) - 1)
+            case pygame.K_UP:
+                self.rate = min(self.rate + 1, len(PLAYBACK_RATES) - 1)
+            case pygame.K_DOWN:
+                self.rate = max(self.rate - 1, 0)
+            case pygame.K_RETURN | pygame.K_KP_ENTER:
+                if self.typed_step:
+                    self.seek(int(self.typed_step))
+                self.typed_step = ""
+            case pygame.K_BACKSPACE:
+                self.typed_step = self.typed_step[:-1]
+            case pygame.K_m:
+                self.current_screen = "menu"
+                self.stop()
+            case _:
+                if event.unicode.isdigit():
+                    self.typed_step += event.unicode
+
+    def sub_loop(self):
+        """
+        Manage the replay screen's content and interactions.
+        """
+        self.advance()
+        self.scrub()
+        x, y, species = self.reader.get_step(self.get_step())
+        self.draw_sprites(x, y, species)
+        self.draw_score_bars(species)
+        self.draw_timeline()
+        self.draw_status()
+
+    def draw_sprites(self, x, y, species):
+        """
+        Draw the sprites inside the viewport through the camera.
+
+        Args:
+            x (numpy.ndarray): The x coordinate of every sprite in the world.
+            y (numpy.ndarray): The y coordinate of every sprite in the world.
+            species (numpy.ndarray): The species of every sprite.
+        """
+        visible = self.camera.get_visible(x, y)
+        left, top = self.camera.to_screen(x[visible], y[visible])
+        images = self.get_images()
+        self.screen.set_clip(self.viewport)
+        self.screen.blits(
+            [
+                (images[kind], position)
+                for kind, position in zip(
+                    species[visible].tolist(), zip(left.tolist(), top.tolist())
+                )
+            ],
+            doreturn=False,
+        )
+        self.screen.set_clip(None)
+
+    def get_images(self):
+        """
+        Get the shared image of every species at the sprite size of the current zoom level.
+        The images of the previous size are removed from the cache when the size changes.
+
+        Returns:
+            list: The image of every species.
+        """
+        size = self.camera.get_sprite_size()
+        if size != self.image_size:
+            if self.image_size not in (None, constants.SPRITE_SIZE):
+                sprite_cache.evict(self.image_size)
+            self.images = [sprite_cache.get_image(name, size) for name in self.names]
+            self.image_size = size
+        return self.images
+
+    def advance(self):
+        """
+        Move the playback position by the time passed since the last frame.
+        """
+        now = time.perf_counter()
+        elapsed = now - self.last_frame_time
+        self.last_frame_time = now
+        if not self.playing:
+            return
+        self.seek(self.position + elapsed * constants.STEP_RATE * PLAYBACK_RATES[self.rate])
+        if self.get_step() == len(self.reader) - 1:
+            self.playing = False
+
+    def scrub(self):
+        """
+        Jump to the step under the mouse while the left button is held on the timeline.
+        """
+        if not pygame.mouse.get_pressed()[0]:
+            return
+        mx, my = pygame.mouse.get_pos()
+        if TIMELINE_TOP <= my < TIMELINE_TOP + TIMELINE_HEIGHT:
+            self.seek(mx / constants.RESOLUTION * (len(self.reader) - 1))
+
+    def draw_score_bars(self, species):
+        """
+        Draw the score bars of the current step at the bottom of the screen.
+
+        Args:
+            species (numpy.ndarray): The species of every sprite.
+        """
+        counts = np.bincount(species, minlength=len(self.score_bars))
+        multiplier = constants.RESOLUTION / len(species)
+        start = 0
+        for score_bar, count in zip(self.score_bars[:-1], counts):
+            score_bar.draw(start, count * multiplier)
+            start += count * multiplier
+        self.score_bars[-1].draw(start, constants.RESOLUTION)
+
+    def draw_timeline(self):
+        """
+        Draw the timeline with a marker at the current step.
+        """
+        pygame.draw.rect(
+            self.screen,
+            constants.ROCK_COLOR,
+            (0, TIMELINE_TOP, constants.RESOLUTION, TIMELINE_HEIGHT),
+        )
+        marker = self.position / max(len(self.reader) - 1, 1) * constants.RESOLUTION
+        pygame.draw.rect(
+            self.screen,
+            constants.TEXTCOLOR,
+            (marker - 2, TIMELINE_TOP, 4, TIMELINE_HEIGHT),
+        )
+
+    def draw_status(self):
+        """
+        Draw the current step, the playback rate and the typed jump target.
+        """
+        state = "PLAY" if self.playing else "PAUSE"
+        status = f"{self.get_step()}/{len(self.reader) - 1} {PLAYBACK_RATES[self.rate]}x {state}"
+        if self.typed_step:
+            status += f" GO TO {self.typed_step}"
+        image = text_cache.render(status, 10, constants.TEXTCOLOR)
+        self.screen.blit(image, (5, 5))
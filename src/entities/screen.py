@@ -5,6 +5,7 @@ import sys
 from abc import ABC, abstractmethod
 import pygame
 from src.utils import constants
+from src.utils.profiler import profile
 
 
 class Screen(ABC):
@@ -24,6 +25,7 @@ class Screen(ABC):
         self.clock = pygame.time.Clock()  # Pygame clock for controlling frame rate
         self.click = False  # Flag to track mouse clicks
         self.is_running = True  # Flag to control the main loop
+        self.profiler = None  # FrameProfiler timing the phases of every frame, if any
 
     def get_current_screen(self):
         """
@@ -64,19 +66,28 @@ class Screen(ABC):
         2. Clears the screen by filling it with background color.
         3. Checks for user inputs.
         4. Calls `sub_loop` abstract method implemented by subclasses.
-        5. Updates display.
+        5. Updates display, subclasses can override `update_display` to update only parts of it.
         6. Limits framerate at 60 FPS.
+        Every phase is timed if the screen has a profiler.
         This method is responsible for coordinating the screen's operations, including
         updating the display, checking user input events, and managing the frame rate.
 
         Called within the `Main` class's `loop_screen`.
         """
         self.click = False
-        self.blit_background()
-        self.check_events()
-        self.sub_loop()
-        pygame.display.flip()
-        self.clock.tick(60)
+        if self.profiler is not None:
+            self.profiler.start_frame()
+        with profile(self.profiler, "render"):
+            self.blit_background()
+        with profile(self.profiler, "events"):
+            self.check_events()
+        with profile(self.profiler, "render"):
+            self.sub_loop()
+        with profile(self.profiler, "display"):
+            self.update_display()
+        if self.profiler is not None:
+            self.profiler.end_frame()
+        self.clock.tick(constants.FPS)
 
     def blit_background(self):
         """
@@ -84,20 +95,39 @@ class Screen(ABC):
         """
         self.screen.fill(constants.BGCOLOR)
 
+    def update_display(self):
+        """
+        Updates the whole display with the content of the screen surface.
+        """
+        pygame.display.flip()
+
     def check_events(self):
         """
         Checks for user input events such as key presses or window close events.
+        The screen is stopped before the game exits, so it can finish the files it writes.
         """
         events = pygame.event.get()
         for event in events:
             if event.type == pygame.QUIT:
+                self.stop()
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.stop()
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 self.click = True
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        """
+        Handle a user input event specific to the screen.
+        Does nothing by default, subclasses can override it to react to their own inputs.
+
+        Args:
+            event (pygame.event.Event): The event to handle.
+        """
 
     @abstractmethod
     def sub_loop(self):
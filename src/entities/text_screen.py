@@ -5,6 +5,7 @@ creating the menu and the game over screens.
 import pygame
 from src.entities.screen import Screen
 from src.utils import constants
+from src.utils.text_cache import text_cache
 
 
 class TextScreen(Screen):
@@ -31,7 +32,7 @@ class TextScreen(Screen):
         Returns:
             pygame.Rect: The rectangular area of the rendered text.
         """
-        image = pygame.font.Font(constants.FONT, font_size).render(text, 1, color)
+        image = text_cache.render(text, font_size, color)
         rect = image.get_rect()
         rect.center = (constants.RESOLUTION / 2, y_coordinate)
         self.screen.blit(image, rect)
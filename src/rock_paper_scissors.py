@@ -1,12 +1,24 @@
 """
     This module is the entry point for the game, responsible for setting up the game window, handling different
     game screens, and managing the main game loop.
+
+    The game screen, and the simulation with SciPy behind it, is imported on a background thread once the
+    first frame is shown, so the window opens without waiting for it.
 """
+import atexit
+import importlib
+import sys
+import threading
 import pygame
 from src.utils import constants
+from src.utils.bundle import asset_bundle
+from src.utils.profiler import FrameProfiler
+from src.utils.startup import StartupTimer
 from src.entities.menu_screen import MenuScreen
 from src.entities.game_over_screen import GameOverScreen
-from src.entities.game_screen import GameScreen
+from src.entities.replay_screen import ReplayScreen
+
+GAME_SCREEN_MODULE = "src.entities.game_screen"
 
 
 class RockPaperScissors:
@@ -14,19 +26,91 @@ class RockPaperScissors:
     The main game class responsible for initializing, managing, and running the Rock Paper Scissors game.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        seed=None,
+        record_dir=None,
+        replay=None,
+        profile=None,
+        world_width=constants.WORLD_WIDTH,
+        world_height=constants.WORLD_HEIGHT,
+        rules=None,
+        timeseries_dir=None,
+        snapshot_dir=None,
+        capture_dir=None,
+        capture_format="png",
+        capture_size=None,
+        threaded=False,
+        lod=1,
+        target_refresh=1,
+        validate_targets=False,
+        startup=None,
+    ):
         """
         Initialize the game.
+
+        Args:
+            seed (int): The seed of every match, to replay the same match (default: a fresh seed per match).
+            record_dir (str): The directory to record replays of the matches into (default: no replays).
+            replay (str): The path of a replay file to play back before the menu (default: None).
+            profile (str): The path of a CSV or JSON file to write the frame timings into on exit
+                (default: frames are only timed while the overlay is shown).
+            world_width (int): The width of the simulated world (default: constants.WORLD_WIDTH).
+            world_height (int): The height of the simulated world (default: constants.WORLD_HEIGHT).
+            rules (Rules): The species and who eats whom (default: rock, paper, scissors).
+            timeseries_dir (str): The directory to write the population time series of the matches
+                into (default: no time series files).
+            snapshot_dir (str): The directory to save the snapshots taken in the game into
+                (default: snapshots are only kept in memory).
+            capture_dir (str): The directory to capture the rendered frames of the matches into
+                (default: no capture).
+            capture_format (str): "png" to save the frames as PNG files, or the extension of the
+                video files to encode them into (default: "png").
+            capture_size (tuple): The width and height of the captured frames
+                (default: the size of the window).
+            threaded (bool): Whether to run the simulation on a worker thread while the frames
+                are rendered (default: False).
+            lod (int): The steps between two searches of the sprites far from any prey and hunter,
+                or "auto" to adapt it to the time the steps take (default: 1, every step).
+            target_refresh (int): The steps after which a sprite searches for its prey and hunter
+                again, even if it kept them (default: 1, every step, without keeping targets).
+            validate_targets (bool): Whether to compare the kept targets with an exact search
+                (default: False).
+            startup (StartupTimer): The timer of the startup phases (default: a timer that
+                starts now and prints nothing).
         """
         pygame.init()
+        self.seed = seed
+        self.record_dir = record_dir
+        self.replay = replay
+        self.world_width = world_width
+        self.world_height = world_height
+        self.rules = rules
+        self.timeseries_dir = timeseries_dir
+        self.snapshot_dir = snapshot_dir
+        self.capture_dir = capture_dir
+        self.capture_format = capture_format
+        self.capture_size = capture_size
+        self.threaded = threaded
+        self.lod = lod
+        self.target_refresh = target_refresh
+        self.validate_targets = validate_targets
+        self.startup = startup if startup is not None else StartupTimer()
+        self.profiler = FrameProfiler(enabled=profile is not None)
+        if profile is not None:
+            atexit.register(self.profiler.dump, profile)
         self.running = True
-        self.current_screen = "menu"
+        self.current_screen = "replay" if replay is not None else "menu"
         self.screen = pygame.display.set_mode(
             (constants.RESOLUTION, constants.RESOLUTION)
         )
         pygame.display.set_caption("Rock Paper Scissors")
-        icon = pygame.image.load("assets/sprites/logo.png")
+        self.startup.mark("window")
+        icon = asset_bundle.get_image(constants.LOGO, (constants.ICON_SIZE, constants.ICON_SIZE))
+        if icon is None:
+            icon = pygame.image.load(constants.LOGO)
         pygame.display.set_icon(icon)
+        self.startup.mark("icon")
 
     def run_game(self):
         """
@@ -36,6 +120,7 @@ class RockPaperScissors:
         - MenuScreen: Allows the player to set game options like speed and group size.
         - GameScreen: The main game screen where the Rock Paper Scissors battle takes place.
         - GameOverScreen: Displays the game result when it's over.
+        - ReplayScreen: Plays back a recorded match.
         """
         while self.running:
             match self.current_screen:
@@ -45,12 +130,36 @@ class RockPaperScissors:
                     speed = menu.get_speed()
                     group_size = menu.get_group_size()
                 case "game":
-                    game = GameScreen(self.screen, speed, group_size)
+                    from src.entities.game_screen import GameScreen
+
+                    game = GameScreen(
+                        self.screen,
+                        speed,
+                        group_size,
+                        seed=self.seed,
+                        record_dir=self.record_dir,
+                        profiler=self.profiler,
+                        world_width=self.world_width,
+                        world_height=self.world_height,
+                        rules=self.rules,
+                        timeseries_dir=self.timeseries_dir,
+                        snapshot_dir=self.snapshot_dir,
+                        capture_dir=self.capture_dir,
+                        capture_format=self.capture_format,
+                        capture_size=self.capture_size,
+                        threaded=self.threaded,
+                        lod=self.lod,
+                        target_refresh=self.target_refresh,
+                        validate_targets=self.validate_targets,
+                    )
                     self.loop_screen(game)
                     winner = game.get_winner()
                 case "game_over":
                     game_over = GameOverScreen(self.screen, winner)
                     self.loop_screen(game_over)
+                case "replay":
+                    replay = ReplayScreen(self.screen, self.replay)
+                    self.loop_screen(replay)
 
     def loop_screen(self, looped_screen):
         """
@@ -59,8 +168,25 @@ class RockPaperScissors:
         Args:
             looped_screen: An instance of a game screen class (MenuScreen, GameScreen, or GameOverScreen).
         """
+        name = self.current_screen
         screen_running = True
         while screen_running:
             looped_screen.main_loop()
+            if name not in self.startup.shown_screens:
+                self.startup.mark_frame(name)
+                self.preload_game_screen()
             self.current_screen = looped_screen.get_current_screen()
             screen_running = looped_screen.get_is_running()
+        self.startup.restart()
+
+    def preload_game_screen(self):
+        """
+        Import the game screen module on a background thread, unless it is imported already,
+        so that starting a match does not wait for it.
+        """
+        if GAME_SCREEN_MODULE in sys.modules:
+            return
+        thread = threading.Thread(
+            target=importlib.import_module, args=(GAME_SCREEN_MODULE,), daemon=True
+        )
+        thread.start()
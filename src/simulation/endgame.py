@@ -0,0 +1,72 @@
+"""
+This module recognizes matches whose winner is already decided and estimates how long they would
+still take to play out.
+
+A match is decided when one of the species left is eaten by none of the others and eats all
+of them: it can only gain sprites from then on, so it wins, however long the chase takes.
+With rock, paper, scissors this happens as soon as one species dies out.
+
+The length of the rest of the match comes from a reduced model of the chase instead of the
+simulation: the steps needed to catch the last prey grow with the distance from the prey farthest
+from any hunter, in units of the speed, and shrink with the number of hunters. The model was fitted
+on rock, paper, scissors matches with group sizes of 10 to 100 and speeds of 1 to 5 in the default
+world. Half of its estimates are within 16% below and 30% above the simulated length.
+"""
+import numpy as np
+from src.simulation.nearest import NearestIndex
+
+# Coefficients of the reduced model:
+# steps = SCALE * (farthest prey distance / speed) ** DISTANCE_EXPONENT * hunters ** HUNTER_EXPONENT
+SCALE = 57.0
+DISTANCE_EXPONENT = 0.56
+HUNTER_EXPONENT = -0.43
+
+
+def get_decided_winner(simulation):
+    """
+    Get the species bound to win the match, if it is decided.
+
+    Args:
+        simulation (Simulation): The simulation of the match.
+
+    Returns:
+        int: The index of the winning species, or None if the outcome is still open.
+    """
+    alive = simulation.get_counts() > 0
+    dominance = simulation.rules.dominance
+    for species in np.flatnonzero(alive):
+        others = alive.copy()
+        others[species] = False
+        if not dominance[others, species].any() and dominance[species, others].all():
+            return int(species)
+    return None
+
+
+def estimate_remaining_steps(simulation, winner):
+    """
+    Estimate the number of steps a decided match takes until the winner ate every other sprite.
+
+    Args:
+        simulation (Simulation): The simulation of the match.
+        winner (int): The index of the winning species.
+
+    Returns:
+        int: The estimated number of steps, 0 if the match is over.
+    """
+    is_hunter = simulation.species == winner
+    prey = np.flatnonzero(~is_hunter)
+    if len(prey) == 0:
+        return 0
+    hunters = np.flatnonzero(is_hunter)
+    closest = NearestIndex(hunters, simulation.x[hunters], simulation.y[hunters]).query(
+        simulation.x[prey], simulation.y[prey]
+    )
+    distance = np.hypot(
+        simulation.x[closest] - simulation.x[prey], simulation.y[closest] - simulation.y[prey]
+    ).max()
+    steps = (
+        SCALE
+        * (max(distance, 1.0) / simulation.speed) ** DISTANCE_EXPONENT
+        * len(hunters) ** HUNTER_EXPONENT
+    )
+    return int(round(steps))
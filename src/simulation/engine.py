@@ -0,0 +1,685 @@
+"""
+This module defines the `Simulation` class, the vectorized core of the Rock, Paper, Scissors simulation.
+
+The state of every sprite is kept in contiguous NumPy arrays (structure of arrays) and a `step`
+updates a whole group with a few array operations. The rules are the ones the sprites used to apply
+one by one: chase the closest prey, eat it when inside the hitbox, evade the closest hunter when it
+is close by, push away from overlapping sprites of the same group, avoid the walls and stay inside them.
+A push depends on where the other sprites of the group are at that moment, so the pushes and the walls
+are still applied one sprite after the other, the rest of the rules move the whole group at once.
+
+Which species eats which comes from the `Rules` of the simulation, so any number of species works.
+
+With a level of detail interval above 1, sprites far from any prey and hunter only search for them
+every `lod_interval` steps, spread over the steps by sprite, and repeat the movement of their last
+search in between. Such a sprite cannot reach a prey or a hunter before its next search, so it only
+misses changes of direction; the size of the missed changes is measured when it searches again.
+
+With a target refresh interval above 1, every sprite keeps its closest prey and hunter in a
+`TargetCache` and only searches again when they are gone or got away, or every `target_refresh`
+steps.
+
+The module does not depend on Pygame, so it can be used without a display.
+"""
+import math
+import numpy as np
+from src.simulation.nearest import NearestIndex
+from src.simulation.rules import DEFAULT_RULES, RULES
+from src.simulation.spatial_hash import CellLists, SpatialHash
+from src.simulation.target_cache import TargetCache, get_target_stats
+from src.utils import constants
+from src.utils.profiler import profile
+
+
+class Simulation:
+    """
+    A class holding the state of all sprites and advancing it step by step.
+    """
+
+    def __init__(
+        self,
+        speed,
+        group_size,
+        rng=None,
+        width=constants.WORLD_WIDTH,
+        height=constants.WORLD_HEIGHT,
+        rules=None,
+    ):
+        """
+        Initialize a `Simulation` object and spawn the sprites at random locations.
+
+        Args:
+            speed (int): The speed of the sprites.
+            group_size (int): The number of sprites in each contender group.
+            rng (numpy.random.Generator): The random generator used for every random draw
+                (default: a freshly seeded generator).
+            width (int): The width of the world the sprites can move in.
+            height (int): The height of the world the sprites can move in.
+            rules (Rules): The species and who eats whom (default: rock, paper, scissors).
+
+        The original game spawned and steered the sprites on the whole window, score bars included,
+        and only kept them above the score bars. In the default world the rules still use an area
+        `SCORE_BAR_MARGIN` taller than the world, so matches play out like they used to, other
+        worlds use their own area.
+        """
+        self.speed = speed
+        self.group_size = group_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.rules = rules if rules is not None else RULES[DEFAULT_RULES]
+        self.width = width
+        self.height = height
+        # Height of the area the sprites spawn in and avoid the walls of
+        self.outer_height = height
+        if (width, height) == (constants.WORLD_WIDTH, constants.WORLD_HEIGHT):
+            self.outer_height += constants.SCORE_BAR_MARGIN
+        self.size = constants.SPRITE_SIZE
+        self.hitbox = self.size * constants.HITBOX_RATIO
+        # Area of the top left corners of the sprites that do not avoid the walls, the center of
+        # the sprite is out of the outer quarters of the world
+        half = self.size // 2
+        self.inner_area = (
+            width * 0.25 - half,
+            width * 0.75 - half,
+            self.outer_height * 0.25 - half,
+            height * 0.27 - half,
+        )
+        self.steps = 0
+        # Neighbours are looked up a sprite size plus some slack around the sprites, for sprites
+        # pushed a few times and neighbours that moved a few pixels while the group settles
+        self.grid = SpatialHash(self.size + 4 * speed + 3, width, height)
+        self.nearest_indexes = {}  # Cached NearestIndex of every set of species that has not moved
+        self.profiler = None  # FrameProfiler timing the phases of a step, if any
+        # Statistics of the last step: sprites every species gained by eating, and the mean
+        # distance of its sprites to their closest prey (NaN if there was no prey)
+        self.conversions = np.zeros(len(self.rules), dtype=int)
+        self.prey_distances = np.full(len(self.rules), np.nan)
+
+        count = group_size * len(self.rules)
+        # Sprites are stored group by group, in the order of the species in the rules
+        self.species = np.repeat(np.arange(len(self.rules)), group_size)
+        self.x = self.rng.integers(10, width - 9, count).astype(float)
+        self.y = self.rng.integers(10, self.outer_height - 9, count).astype(float)
+
+        # Level of detail: steps between two searches of a distant sprite, 1 searches every step
+        self.lod_interval = 1
+        self.distant = np.zeros(count, dtype=bool)  # Far from any prey and hunter at last search
+        # Movement of every sprite caused by its last search, repeated while it is not searching
+        self.velocity_x = np.zeros(count)
+        self.velocity_y = np.zeros(count)
+        # Sprite updates, skipped searches, and the number and summed size of the measured
+        # differences between a repeated movement and the movement of the next search
+        self.lod_stats = {"updates": 0, "skipped": 0, "checked": 0, "error": 0.0}
+
+        # Steps between two searches of a sprite that keeps its targets, 1 searches every step
+        self.target_refresh = 1
+        self.validate_targets = False  # Whether kept targets are compared with an exact search
+        self.prey_cache = TargetCache(count)
+        self.hunter_cache = TargetCache(count)
+
+    def __len__(self):
+        """
+        Get the number of sprites in the simulation.
+
+        Returns:
+            int: The number of sprites.
+        """
+        return len(self.species)
+
+    def get_counts(self):
+        """
+        Get the number of sprites in each group.
+
+        Returns:
+            numpy.ndarray: The sprite count of every species, indexed by species.
+        """
+        return np.bincount(self.species, minlength=len(self.rules))
+
+    def get_winner(self):
+        """
+        Get the species that converted every other sprite.
+
+        Returns:
+            int: The index of the winning species, or None if the game is not over yet.
+        """
+        counts = self.get_counts()
+        if counts.max() == len(self):
+            return int(counts.argmax())
+        return None
+
+    def step(self):
+        """
+        Advance every sprite by one step.
+
+        The groups are updated one after the other, like the sprites used to be. Every sprite
+        of the updated group moves at once in the first two phases, which only depend on the
+        other groups, and one after the other in the last two:
+        1. Chase the closest sprite of any prey species and eat it if it is inside the hitbox.
+        2. Evade the closest sprite of any hunter species if it is close by.
+        3. Push away from overlapping sprites of the same group.
+        4. Avoid and stay inside the walls.
+        Eaten sprites join the group of their hunter right away and sit out the rest of the step.
+        """
+        converted = np.zeros(len(self), dtype=bool)
+        self.conversions[:] = 0
+        self.prey_distances[:] = np.nan
+        for species in range(len(self.rules)):
+            movers = np.flatnonzero((self.species == species) & ~converted)
+            self.update_group(movers, species, converted)
+        self.steps += 1
+
+    def update_group(self, movers, species, converted):
+        """
+        Update the sprites of one group.
+
+        Args:
+            movers (numpy.ndarray): The indices of the sprites to update.
+            species (int): The species of the updated sprites.
+            converted (numpy.ndarray): Boolean mask of the sprites eaten in this step, updated in place.
+        """
+        start_x, start_y = self.x[movers], self.y[movers]
+        searching = movers
+        if self.lod_interval > 1:
+            with profile(self.profiler, "lod"):
+                coasting = self.get_coasting(movers)
+                self.coast(movers[coasting])
+                searching = movers[~coasting]
+
+        with profile(self.profiler, "nearest"):
+            prey = self.find_target(searching, self.prey_cache, self.rules.prey[species])
+        with profile(self.profiler, "chase"):
+            if (prey >= 0).any():
+                distance_x, distance_y = self.get_distances(
+                    searching[prey >= 0], prey[prey >= 0]
+                )
+                self.prey_distances[species] = np.hypot(distance_x, distance_y).mean()
+            self.chase(searching, prey, 1)
+            eaten = self.find_eaten(searching, prey)
+            if len(eaten) > 0:
+                self.invalidate_nearest_indexes(np.unique(self.species[eaten]).tolist())
+                if self.target_refresh > 1:
+                    self.prey_cache.forget(eaten)
+                    self.hunter_cache.forget(eaten)
+            self.species[eaten] = species
+            self.distant[eaten] = False
+            converted[eaten] = True
+            self.conversions[species] += len(eaten)
+
+        with profile(self.profiler, "nearest"):
+            hunter = self.find_target(
+                searching,
+                self.hunter_cache,
+                self.rules.hunters[species],
+                max_distance=constants.HUNTER_RADIUS,
+            )
+        with profile(self.profiler, "evade"):
+            self.evade(searching, hunter)
+
+        if self.lod_interval > 1:
+            with profile(self.profiler, "lod"):
+                self.update_distant(
+                    searching, prey, hunter, start_x[~coasting], start_y[~coasting]
+                )
+
+        with profile(self.profiler, "collision"):
+            self.settle(movers, species, start_x, start_y)
+        self.invalidate_nearest_indexes([species])
+
+    def get_coasting(self, movers):
+        """
+        Find the sprites that repeat their last movement in this step instead of searching.
+        A distant sprite searches every `lod_interval` steps, sprites take turns by their index.
+
+        Args:
+            movers (numpy.ndarray): The indices of the moving sprites.
+
+        Returns:
+            numpy.ndarray: Boolean mask of the movers that do not search.
+        """
+        return self.distant[movers] & ((movers + self.steps) % self.lod_interval != 0)
+
+    def coast(self, movers):
+        """
+        Move sprites by the movement of their last search.
+
+        Args:
+            movers (numpy.ndarray): The indices of the moving sprites.
+        """
+        self.x[movers] += self.velocity_x[movers]
+        self.y[movers] += self.velocity_y[movers]
+        self.lod_stats["skipped"] += len(movers)
+
+    def update_distant(self, movers, prey, hunter, start_x, start_y):
+        """
+        Store the movement of the sprites that searched in this step, measure how much it differs
+        from the movement they repeated since their previous search, and find the distant ones.
+
+        Args:
+            movers (numpy.ndarray): The indices of the sprites that searched.
+            prey (numpy.ndarray): The index of the closest prey of every mover, -1 if it has none.
+            hunter (numpy.ndarray): The index of the closest hunter of every mover, -1 if none
+                is within the hunter radius.
+            start_x (numpy.ndarray): The x coordinate of every mover before it searched.
+            start_y (numpy.ndarray): The y coordinate of every mover before it searched.
+        """
+        velocity_x = self.x[movers] - start_x
+        velocity_y = self.y[movers] - start_y
+        checked = self.distant[movers]
+        if checked.any():
+            error = np.hypot(
+                velocity_x[checked] - self.velocity_x[movers[checked]],
+                velocity_y[checked] - self.velocity_y[movers[checked]],
+            )
+            self.lod_stats["checked"] += len(error)
+            self.lod_stats["error"] += float(error.sum())
+        self.velocity_x[movers] = velocity_x
+        self.velocity_y[movers] = velocity_y
+        self.lod_stats["updates"] += len(movers)
+
+        reach = constants.LOD_RADIUS + self.get_lod_margin()
+        self.distant[movers] = self.is_beyond(movers, prey, reach) & self.is_beyond(
+            movers, hunter, reach
+        )
+
+    def is_beyond(self, movers, targets, reach):
+        """
+        Check which sprites have no target within reach.
+
+        Args:
+            movers (numpy.ndarray): The indices of the sprites.
+            targets (numpy.ndarray): The index of the target of every sprite, -1 if it has none.
+            reach (float): The distance a target has to be farther away than.
+
+        Returns:
+            numpy.ndarray: Boolean mask of the sprites without a target or with a target out of reach.
+        """
+        has_target = targets >= 0
+        distance_x, distance_y = self.get_distances(movers[has_target], targets[has_target])
+        beyond = np.ones(len(movers), dtype=bool)
+        beyond[has_target] = np.hypot(distance_x, distance_y) > reach
+        return beyond
+
+    def get_lod_margin(self):
+        """
+        Get the distance a sprite and its target can close in between two searches of the sprite,
+        both moving towards each other at full speed.
+
+        Returns:
+            float: The margin in pixels, 0 if every sprite searches every step.
+        """
+        if self.lod_interval == 1:
+            return 0
+        return 2 * self.speed * self.lod_interval
+
+    def get_lod_stats(self):
+        """
+        Get how many searches the level of detail skipped and the error it introduced.
+
+        Returns:
+            dict: The fraction of sprite updates without a search, and the mean distance in pixels
+                between the movement a distant sprite repeated and the movement of its next search.
+        """
+        stats = self.lod_stats
+        updates = stats["updates"] + stats["skipped"]
+        return {
+            "skipped": stats["skipped"] / updates if updates > 0 else 0.0,
+            "error": stats["error"] / stats["checked"] if stats["checked"] > 0 else 0.0,
+        }
+
+    def find_target(self, movers, cache, target_species, max_distance=np.inf):
+        """
+        Find the target of every moving sprite, the closest one or the one kept in the cache.
+
+        Args:
+            movers (numpy.ndarray): The indices of the searching sprites.
+            cache (TargetCache): The cache of the targets of this kind.
+            target_species (tuple): The species to search for.
+            max_distance (float): Targets at least this far away are ignored (default: no limit).
+
+        Returns:
+            numpy.ndarray: The index of the target of every mover, -1 if there is none.
+        """
+        if self.target_refresh == 1:
+            return self.find_closest(movers, target_species, max_distance)
+        return cache.find(
+            self, movers, target_species, self.target_refresh, max_distance, self.validate_targets
+        )
+
+    def get_target_stats(self):
+        """
+        Get how many targets were kept instead of searched for, and how often kept targets
+        were not the closest ones in validation mode.
+
+        Returns:
+            dict: The fraction of kept targets, the fraction of the validated ones that were not
+                the closest one and how many pixels farther away they were on average.
+        """
+        return get_target_stats([self.prey_cache, self.hunter_cache])
+
+    def find_closest(self, movers, target_species, max_distance=np.inf):
+        """
+        Find the closest sprite of any of the target species for every moving sprite.
+
+        Args:
+            movers (numpy.ndarray): The indices of the searching sprites.
+            target_species (tuple): The species to search for.
+            max_distance (float): Targets at least this far away are ignored (default: no limit).
+
+        Returns:
+            numpy.ndarray: The index of the closest target of every mover, -1 if there is none.
+        """
+        return self.get_nearest_index(target_species).query(
+            self.x[movers], self.y[movers], max_distance
+        )
+
+    def get_nearest_index(self, species):
+        """
+        Get the nearest neighbour index of a set of species, building it if any of them changed since.
+
+        Args:
+            species (tuple): The indexed species.
+
+        Returns:
+            NearestIndex: The index of the sprites of the species.
+        """
+        if species not in self.nearest_indexes:
+            members = np.flatnonzero(np.isin(self.species, species))
+            self.nearest_indexes[species] = NearestIndex(
+                members, self.x[members], self.y[members]
+            )
+        return self.nearest_indexes[species]
+
+    def invalidate_nearest_indexes(self, changed):
+        """
+        Drop the cached nearest neighbour indexes of every set containing a changed species.
+
+        Args:
+            changed (list): The species whose sprites moved, appeared or disappeared.
+        """
+        for species in list(self.nearest_indexes):
+            if not set(species).isdisjoint(changed):
+                del self.nearest_indexes[species]
+
+    def get_distances(self, movers, targets):
+        """
+        Calculate the distances between sprites and their targets in terms of x and y coordinates.
+
+        Args:
+            movers (numpy.ndarray): The indices of the sprites.
+            targets (numpy.ndarray): The index of the target of every sprite.
+
+        Returns:
+            tuple: The distances in x and y directions.
+        """
+        return self.x[targets] - self.x[movers], self.y[targets] - self.y[movers]
+
+    def chase(self, movers, targets, direction):
+        """
+        Move sprites towards (or away from) their targets.
+
+        Args:
+            movers (numpy.ndarray): The indices of the moving sprites.
+            targets (numpy.ndarray): The index of the target of every mover, -1 if it has none.
+            direction (float): The chase direction (positive for chasing, negative for evading).
+        """
+        has_target = targets >= 0
+        movers = movers[has_target]
+        distance_x, distance_y = self.get_distances(movers, targets[has_target])
+        distance = np.hypot(distance_x, distance_y)
+        moving = distance > 0
+        movers = movers[moving]
+        steps = direction * self.rng.uniform(self.speed * 0.7, self.speed, len(movers))
+        movement = steps / distance[moving]
+        self.x[movers] = round_pixels(self.x[movers] + distance_x[moving] * movement)
+        self.y[movers] = round_pixels(self.y[movers] + distance_y[moving] * movement)
+
+    def find_eaten(self, movers, prey):
+        """
+        Find the prey caught by the moving sprites.
+
+        Args:
+            movers (numpy.ndarray): The indices of the hunting sprites.
+            prey (numpy.ndarray): The index of the closest prey of every mover, -1 if it has none.
+
+        Returns:
+            numpy.ndarray: The indices of the caught sprites.
+        """
+        has_prey = prey >= 0
+        distance_x, distance_y = self.get_distances(movers[has_prey], prey[has_prey])
+        caught = (np.abs(distance_x) <= self.hitbox) & (np.abs(distance_y) <= self.hitbox)
+        return np.unique(prey[has_prey][caught])
+
+    def evade(self, movers, hunter):
+        """
+        Move sprites away from their closest hunter if it is close by.
+
+        Args:
+            movers (numpy.ndarray): The indices of the moving sprites.
+            hunter (numpy.ndarray): The index of the closest hunter of every mover, -1 if it has none.
+        """
+        has_hunter = hunter >= 0
+        distance_x, distance_y = self.get_distances(movers[has_hunter], hunter[has_hunter])
+        close_by = np.zeros(len(movers), dtype=bool)
+        close_by[has_hunter] = np.hypot(distance_x, distance_y) < constants.HUNTER_RADIUS
+        self.chase(movers[close_by], hunter[close_by], -0.95)
+
+    def settle(self, movers, species, start_x, start_y):
+        """
+        Push the moving sprites away from the overlapping sprites of their own group and make
+        them avoid and stay inside the walls, one sprite after the other in the order of their
+        indices, like the sprites used to.
+
+        A sprite sees the movers settled before it at their new positions and the ones after it
+        at their positions from before the step. Pushing every sprite away from all overlapping
+        sprites at once instead pushes the sprites of crowded groups much further, and matches
+        end in standoffs that the original game never had.
+
+        Args:
+            movers (numpy.ndarray): The indices of the moving sprites, in ascending order.
+            species (int): The species of the moving sprites.
+            start_x (numpy.ndarray): The x coordinate of every mover before the step.
+            start_y (numpy.ndarray): The y coordinate of every mover before the step.
+        """
+        moved_x, moved_y = self.x[movers], self.y[movers]
+        self.x[movers] = start_x
+        self.y[movers] = start_y
+        members = np.flatnonzero(self.species == species)
+        neighbours = self.find_neighbours(movers, members, moved_x, moved_y)
+        # The neighbours of a mover are the sprites close to it while the group was at its
+        # positions from before the step. They hold every sprite it can overlap as long as it is
+        # pushed less than `drift` and the movers settled before it ended up less than `escape`
+        # from where they started. Movers that got further are looked up in `escaped`, and a mover
+        # pushed further looks its neighbours up again around its new position in `cells`.
+        slack = self.grid.cell_size - self.size
+        drift = slack // 2
+        escape = slack - drift
+        escaped = CellLists(self.grid.cell_size)
+        cells = None
+        x, y = self.x.tolist(), self.y.tolist()
+        draws = self.rng.uniform(0, 1, (len(movers), 2)).tolist()
+        for index, (mover, mover_x, mover_y) in enumerate(
+            zip(movers.tolist(), moved_x.tolist(), moved_y.tolist())
+        ):
+            candidates = neighbours[index]
+            if escaped:
+                found = escaped.query(mover_x, mover_y)
+                if found:
+                    candidates = get_later(candidates + found, -1, mover)
+            while candidates:
+                mover_x, mover_y, last = self.self_collision(
+                    mover_x, mover_y, candidates, x, y, drift
+                )
+                if last is None:
+                    break
+                if cells is None:
+                    cells = CellLists(self.grid.cell_size)
+                    for member in members.tolist():
+                        cells.add(member, x[member], y[member])
+                found = cells.query(mover_x, mover_y) + escaped.query(mover_x, mover_y)
+                candidates = get_later(found, last, mover)
+            from_x, from_y = x[mover], y[mover]
+            x[mover], y[mover] = self.check_walls(mover_x, mover_y, *draws[index])
+            if abs(x[mover] - from_x) >= escape or abs(y[mover] - from_y) >= escape:
+                escaped.add(mover, x[mover], y[mover])
+        self.x[movers] = np.array(x)[movers]
+        self.y[movers] = np.array(y)[movers]
+
+    def find_neighbours(self, movers, members, moved_x, moved_y):
+        """
+        Find the sprites of their own group the moving sprites can overlap while the group settles.
+
+        Args:
+            movers (numpy.ndarray): The indices of the moving sprites, which are at their positions
+                from before the step in the state arrays.
+            members (numpy.ndarray): The indices of the sprites of the group, in ascending order.
+            moved_x (numpy.ndarray): The x coordinate of every mover after it moved.
+            moved_y (numpy.ndarray): The y coordinate of every mover after it moved.
+
+        Returns:
+            list: The indices of the possible neighbours of every mover, in ascending order.
+        """
+        self.grid.build(members, self.x[members], self.y[members])
+        queries, candidates = self.grid.query_pairs(moved_x, moved_y)
+        reach = self.grid.cell_size
+        near = (
+            (np.abs(moved_x[queries] - self.x[candidates]) < reach)
+            & (np.abs(moved_y[queries] - self.y[candidates]) < reach)
+            & (movers[queries] != candidates)
+        )
+        queries, candidates = queries[near], candidates[near]
+        order = np.lexsort((candidates, queries))
+        candidates = candidates[order].tolist()
+        bounds = np.searchsorted(queries[order], np.arange(len(movers) + 1)).tolist()
+        return [candidates[start:end] for start, end in zip(bounds, bounds[1:])]
+
+    def self_collision(self, x, y, neighbours, others_x, others_y, drift):
+        """
+        Push a sprite away from the overlapping sprites of its own group. The neighbours are
+        checked one after the other, at the position of the sprite after the pushes so far.
+
+        Args:
+            x (float): The x coordinate of the sprite.
+            y (float): The y coordinate of the sprite.
+            neighbours (list): The indices of the sprites it can overlap, in ascending order.
+            others_x (list): The current x coordinate of every sprite.
+            others_y (list): The current y coordinate of every sprite.
+            drift (float): How far the sprite can be pushed while only its neighbours can
+                overlap it.
+
+        Returns:
+            tuple: The x and y coordinates of the sprite after the pushes, and the last neighbour
+            checked if the sprite was pushed further than `drift` before the end, None otherwise.
+        """
+        size, speed = self.size, self.speed
+        left, right, top, bottom = x - drift, x + drift, y - drift, y + drift
+        for other in neighbours:
+            distance_x = x - others_x[other]
+            distance_y = y - others_y[other]
+            if not (-size < distance_x < size and -size < distance_y < size):
+                continue
+            # distance negative --> sprite is on the left (top), push it further left (up)
+            if distance_x > 0:
+                x += speed
+            elif distance_x < 0:
+                x -= speed
+            if distance_y > 0:
+                y += speed
+            elif distance_y < 0:
+                y -= speed
+            if not (left < x < right and top < y < bottom):
+                return x, y, other
+        return x, y, None
+
+    def check_walls(self, x, y, draw_x, draw_y):
+        """
+        Make a sprite avoid the walls and keep it inside the walls.
+
+        Only sprites in the outer quarters of the world avoid the walls, they are pushed away
+        from the borders by a random fraction of their avoidance.
+
+        Args:
+            x (float): The x coordinate of the sprite.
+            y (float): The y coordinate of the sprite.
+            draw_x (float): A random number between 0 and 1 scaling the avoidance along x.
+            draw_y (float): A random number between 0 and 1 scaling the avoidance along y.
+
+        Returns:
+            tuple: The x and y coordinates of the sprite.
+        """
+        left, right, top, bottom = self.inner_area
+        if not (left <= x <= right and top <= y <= bottom):
+            x = round_pixel(x + draw_x * self.calculate_avoidance(x, self.width))
+            y = round_pixel(y + draw_y * self.calculate_avoidance(y, self.outer_height))
+        # Stay inside the walls
+        max_x, max_y = self.width - self.size, self.height - self.size
+        return (
+            0 if x < 0 else max_x if x > max_x else x,
+            0 if y < 0 else max_y if y > max_y else y,
+        )
+
+    def calculate_avoidance(self, coordinate, extent):
+        """
+        Calculate the wall avoidance of a sprite based on its coordinate.
+
+        Args:
+            coordinate (float): The coordinate value (x or y) of the sprite.
+            extent (float): The extent of the area along the coordinate axis.
+
+        Returns:
+            float: The avoidance factor of the sprite, negative near the far wall.
+        """
+        # Play with avoidance_weight to make the effect weaker or stronger.
+        avoidance_weight = self.speed
+        distance_from_zero = coordinate
+        distance_from_max = extent - coordinate
+        distance_from_border = min(distance_from_zero, distance_from_max)
+        if distance_from_border == 0:
+            return 0
+        avoidance = (
+            avoidance_weight
+            - ((avoidance_weight - 1) / (extent / 4)) * distance_from_border
+        )
+        #  if in the second half of the coordinates, inverse avoidance
+        if distance_from_border == distance_from_max:
+            avoidance *= -1
+        return avoidance
+
+
+def get_later(sprites, last, sprite):
+    """
+    Get the sprites after a sprite, without duplicates and without another sprite.
+
+    Args:
+        sprites (list): The indices of the sprites.
+        last (int): The index the sprites have to be above.
+        sprite (int): The index of the sprite to leave out.
+
+    Returns:
+        list: The indices, in ascending order.
+    """
+    return sorted({other for other in sprites if other > last and other != sprite})
+
+
+def round_pixels(coordinates):
+    """
+    Round coordinates to whole pixels the way Pygame rects do (halves away from zero).
+
+    Args:
+        coordinates (numpy.ndarray): The coordinates to round.
+
+    Returns:
+        numpy.ndarray: The rounded coordinates.
+    """
+    return np.trunc(coordinates + np.copysign(0.5, coordinates))
+
+
+def round_pixel(coordinate):
+    """
+    Round a coordinate to a whole pixel the way Pygame rects do (halves away from zero).
+
+    Args:
+        coordinate (float): The coordinate to round.
+
+    Returns:
+        int: The rounded coordinate.
+    """
+    return math.trunc(coordinate + math.copysign(0.5, coordinate))
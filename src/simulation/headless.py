@@ -0,0 +1,230 @@
+"""
+This module runs Rock, Paper, Scissors matches without a display.
+
+A headless match advances the same `Simulation` the `GameScreen` renders, with no frame cap,
+event handling or blitting, and reports the outcome as a plain dictionary.
+"""
+import os
+import numpy as np
+from src.simulation.endgame import estimate_remaining_steps, get_decided_winner
+from src.simulation.engine import Simulation
+from src.simulation.recorder import ReplayRecorder
+from src.simulation.snapshot import get_snapshot_path, take_snapshot
+from src.simulation.timeseries import PopulationSampler
+from src.utils import constants
+
+
+def create_seed():
+    """
+    Create a fresh random seed, so that matches without a given seed can still be reproduced.
+
+    Returns:
+        int: A 128-bit seed.
+    """
+    return np.random.SeedSequence().entropy
+
+
+def get_replay_path(record_dir, seed, segment=0):
+    """
+    Get the path of the replay file of a match.
+
+    Args:
+        record_dir (str): The directory of the replay files.
+        seed (int): The seed of the match.
+        segment (int): The number of snapshot restores before the recorded part of the match
+            (default: 0, the match from its start).
+
+    Returns:
+        str: The path of the replay file.
+    """
+    return os.path.join(record_dir, f"replay-{get_segment_name(seed, segment)}.rpsr")
+
+
+def get_timeseries_path(timeseries_dir, seed, segment=0):
+    """
+    Get the path of the population time series file of a match.
+
+    Args:
+        timeseries_dir (str): The directory of the time series files.
+        seed (int): The seed of the match.
+        segment (int): The number of snapshot restores before the sampled part of the match
+            (default: 0, the match from its start).
+
+    Returns:
+        str: The path of the time series file.
+    """
+    return os.path.join(timeseries_dir, f"timeseries-{get_segment_name(seed, segment)}.csv")
+
+
+def get_segment_name(seed, segment):
+    """
+    Get the part of a file name that identifies a segment of a match.
+
+    Args:
+        seed (int): The seed of the match.
+        segment (int): The number of snapshot restores before the segment.
+
+    Returns:
+        str: The seed, followed by the segment number after the first segment.
+    """
+    if segment == 0:
+        return str(seed)
+    return f"{seed}-{segment}"
+
+
+def run_match(
+    speed,
+    group_size,
+    seed=None,
+    max_steps=None,
+    record_dir=None,
+    world_width=constants.WORLD_WIDTH,
+    world_height=constants.WORLD_HEIGHT,
+    rules=None,
+    timeseries_dir=None,
+    sample_interval=1,
+    snapshot_dir=None,
+    snapshot_steps=(),
+    endgame="play",
+):
+    """
+    Run a single match until one group wins or the step limit is reached.
+
+    Args:
+        speed (int): The speed of the sprites.
+        group_size (int): The number of sprites in each contender group.
+        seed (int): The seed of the match's random generator (default: a fresh seed).
+        max_steps (int): The maximum number of steps to simulate (default: no limit).
+        record_dir (str): The directory to record a replay of the match into (default: no replay).
+        world_width (int): The width of the simulated world (default: constants.WORLD_WIDTH).
+        world_height (int): The height of the simulated world (default: constants.WORLD_HEIGHT).
+        rules (Rules): The species and who eats whom (default: rock, paper, scissors).
+        timeseries_dir (str): The directory to write the population time series of the match into
+            (default: no time series).
+        sample_interval (int): The number of steps between two samples of the time series (default: 1).
+        snapshot_dir (str): The directory to save the snapshots of the match into (default: None).
+        snapshot_steps (list): The steps to save a snapshot at, if a snapshot directory is given
+            (default: no snapshots).
+        endgame (str): One of `constants.ENDGAME_MODES`: "play" simulates the match to the end,
+            "decide" stops as soon as the winner is decided and "estimate" also estimates the length
+            of the whole match (default: "play").
+
+    Returns:
+        dict: The match settings, the winner (None if the step limit was reached),
+        the number of simulated steps and the final sprite count of every group.
+        Decided matches also hold the endgame mode, and the estimated length of the match
+        in the "estimate" mode.
+    """
+    if seed is None:
+        seed = create_seed()
+    simulation = Simulation(
+        speed, group_size, np.random.default_rng(seed), world_width, world_height, rules
+    )
+    recorder = None
+    if record_dir is not None:
+        recorder = ReplayRecorder(get_replay_path(record_dir, seed), simulation, seed)
+    sampler = None
+    if timeseries_dir is not None:
+        sampler = PopulationSampler(
+            simulation, get_timeseries_path(timeseries_dir, seed), sample_interval
+        )
+
+    snapshot_steps = set(snapshot_steps) if snapshot_dir is not None else set()
+
+    winner = get_winner(simulation, endgame)
+    while winner is None and (max_steps is None or simulation.steps < max_steps):
+        if simulation.steps in snapshot_steps:
+            take_snapshot(simulation, seed).save(
+                get_snapshot_path(snapshot_dir, seed, simulation.steps)
+            )
+        simulation.step()
+        if recorder is not None:
+            recorder.record()
+        if sampler is not None:
+            sampler.sample()
+        winner = get_winner(simulation, endgame)
+
+    if recorder is not None:
+        recorder.close()
+    if sampler is not None:
+        sampler.close()
+    return get_result(simulation, seed, endgame)
+
+
+def run_branch(snapshot, seed=None, max_steps=None, endgame="play"):
+    """
+    Continue a match from a snapshot until one group wins or the step limit is reached.
+
+    Args:
+        snapshot (Snapshot): The state to continue from.
+        seed (int): The seed of the random generator of the continuation
+            (default: the saved generator, to continue exactly like the original match).
+        max_steps (int): The maximum number of steps to simulate, counted from the start
+            of the original match (default: no limit).
+        endgame (str): How to handle a decided match, like in `run_match` (default: "play").
+
+    Returns:
+        dict: The result like `run_match` returns it, with the seed of the continuation
+        (the seed of the original match when continuing exactly) and the step it branched off at.
+    """
+    rng = np.random.default_rng(seed) if seed is not None else None
+    simulation = snapshot.create_simulation(rng)
+    winner = get_winner(simulation, endgame)
+    while winner is None and (max_steps is None or simulation.steps < max_steps):
+        simulation.step()
+        winner = get_winner(simulation, endgame)
+    result = get_result(simulation, seed if seed is not None else snapshot.seed, endgame)
+    result["branch_step"] = snapshot.steps
+    return result
+
+
+def get_winner(simulation, endgame="play"):
+    """
+    Get the winner of a match.
+
+    Args:
+        simulation (Simulation): The simulation of the match.
+        endgame (str): One of `constants.ENDGAME_MODES`, every mode but "play" takes the winner
+            of a decided match (default: "play").
+
+    Returns:
+        int: The index of the winning species, or None if there is no winner yet.
+    """
+    if endgame == "play":
+        return simulation.get_winner()
+    return get_decided_winner(simulation)
+
+
+def get_result(simulation, seed, endgame="play"):
+    """
+    Summarize the state of a simulation.
+
+    Args:
+        simulation (Simulation): The simulation to summarize.
+        seed (int): The seed the simulation was started with.
+        endgame (str): How decided matches were handled, one of
+            `constants.ENDGAME_MODES` (default: "play").
+
+    Returns:
+        dict: The settings, winner, step count and sprite counts of the simulation.
+    """
+    winner = get_winner(simulation, endgame)
+    counts = simulation.get_counts()
+    names = simulation.rules.names
+    result = {
+        "seed": seed,
+        "speed": simulation.speed,
+        "group_size": simulation.group_size,
+        "world_size": [simulation.width, simulation.height],
+        "rules": simulation.rules.name,
+        "winner": names[winner] if winner is not None else None,
+        "steps": simulation.steps,
+        "counts": {name: int(count) for name, count in zip(names, counts)},
+    }
+    if endgame != "play" and winner is not None:
+        result["endgame"] = endgame
+        if endgame == "estimate":
+            result["estimated_steps"] = simulation.steps + estimate_remaining_steps(
+                simulation, winner
+            )
+    return result
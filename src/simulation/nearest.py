@@ -0,0 +1,65 @@
+"""
+This module defines the `NearestIndex` class, which answers batched nearest neighbour queries
+against the sprites of one species.
+
+The index is a `scipy.spatial.cKDTree` when SciPy is installed, so a batch of queries costs
+O(N log N). Without SciPy it falls back to a linear scan of every candidate.
+"""
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # SciPy is optional, the linear scan gives the same answers
+    cKDTree = None
+
+
+class NearestIndex:
+    """
+    A class for finding the closest of a fixed set of sprites.
+    """
+
+    def __init__(self, indices, x, y):
+        """
+        Initialize a `NearestIndex` object over the given sprites.
+
+        Args:
+            indices (numpy.ndarray): The indices of the indexed sprites.
+            x (numpy.ndarray): The x coordinates of the indexed sprites.
+            y (numpy.ndarray): The y coordinates of the indexed sprites.
+        """
+        self.indices = indices
+        self.x = x
+        self.y = y
+        self.tree = None
+        if cKDTree is not None and len(indices) > 0:
+            self.tree = cKDTree(np.column_stack((x, y)))
+
+    def query(self, x, y, max_distance=np.inf):
+        """
+        Find the closest indexed sprite to every query point.
+
+        Args:
+            x (numpy.ndarray): The x coordinates of the query points.
+            y (numpy.ndarray): The y coordinates of the query points.
+            max_distance (float): Sprites at least this far away are ignored (default: no limit).
+
+        Returns:
+            numpy.ndarray: The index of the closest sprite for every query point,
+            -1 if there is none closer than `max_distance`.
+        """
+        if len(self.indices) == 0 or len(x) == 0:
+            return np.full(len(x), -1)
+        if self.tree is not None:
+            distances, positions = self.tree.query(
+                np.column_stack((x, y)), distance_upper_bound=max_distance
+            )
+        else:
+            distance_x = self.x[None, :] - x[:, None]
+            distance_y = self.y[None, :] - y[:, None]
+            squared = distance_x**2 + distance_y**2
+            positions = squared.argmin(axis=1)
+            distances = np.sqrt(squared[np.arange(len(x)), positions])
+        closest = np.full(len(x), -1)
+        found = distances < max_distance
+        closest[found] = self.indices[positions[found]]
+        return closest
@@ -0,0 +1,277 @@
+"""
+This module records simulations into compact, seekable binary replay files and reads them back.
+
+A replay file starts with a small header, holding the settings of the match and the names of its
+species, followed by one frame per step. Every `keyframe_interval`
+steps the frame is a keyframe holding the x and y pixel coordinates of every sprite as little-endian
+unsigned 16-bit integers and their species as unsigned bytes. The frames in between only hold the
+movement of every sprite since the previous step as signed bytes, and the species. A sprite moving
+further than a signed byte allows forces an early keyframe.
+
+Next to the replay file, an index file holds the byte offset of every frame and the step of the
+keyframe it builds on, so any step is decoded from one keyframe and at most `keyframe_interval - 1`
+movement frames. Frames are streamed to disk through buffered files, and readers memory-map
+both files, so neither side ever holds the whole match in memory.
+"""
+import struct
+import numpy as np
+
+MAGIC = b"RPSR"
+VERSION = 3
+# Magic, version, sprite count, speed, width, height, number of species, keyframe interval, seed,
+# comma separated species names
+HEADER = struct.Struct("<4sHIHHHHH16s64s")
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("keyframe", "<u4")])
+
+
+def get_keyframe_dtype(sprite_count):
+    """
+    Get the NumPy type of a keyframe.
+
+    Args:
+        sprite_count (int): The number of sprites in the simulation.
+
+    Returns:
+        numpy.dtype: The structured type of one keyframe.
+    """
+    return np.dtype(
+        [
+            ("x", "<u2", (sprite_count,)),
+            ("y", "<u2", (sprite_count,)),
+            ("species", "u1", (sprite_count,)),
+        ]
+    )
+
+
+def get_delta_dtype(sprite_count):
+    """
+    Get the NumPy type of a movement frame.
+
+    Args:
+        sprite_count (int): The number of sprites in the simulation.
+
+    Returns:
+        numpy.dtype: The structured type of one movement frame.
+    """
+    return np.dtype(
+        [
+            ("dx", "i1", (sprite_count,)),
+            ("dy", "i1", (sprite_count,)),
+            ("species", "u1", (sprite_count,)),
+        ]
+    )
+
+
+def get_index_path(path):
+    """
+    Get the path of the index file of a replay file.
+
+    Args:
+        path (str): The path of the replay file.
+
+    Returns:
+        str: The path of the index file.
+    """
+    return f"{path}.idx"
+
+
+class ReplayRecorder:
+    """
+    A class for streaming the steps of a simulation into a replay file.
+    """
+
+    def __init__(self, path, simulation, seed=None, keyframe_interval=60):
+        """
+        Open a replay file, write its header and record the initial state of the simulation.
+
+        Args:
+            path (str): The path of the replay file.
+            simulation (Simulation): The recorded simulation.
+            seed (int): The seed the simulation was started with, stored in the header (default: None).
+            keyframe_interval (int): The number of steps between two keyframes (default: 60).
+
+        Raises:
+            ValueError: If the species names are longer than 64 characters in total.
+        """
+        names = ",".join(simulation.rules.names).encode("ascii")
+        if len(names) > 64:
+            raise ValueError("the species names do not fit into the replay header")
+        self.simulation = simulation
+        self.keyframe_interval = keyframe_interval
+        self.keyframe = np.zeros(1, dtype=get_keyframe_dtype(len(simulation)))
+        self.delta = np.zeros(1, dtype=get_delta_dtype(len(simulation)))
+        self.index = np.zeros(keyframe_interval, dtype=INDEX_DTYPE)
+        self.buffered = 0  # Index entries not written yet
+        self.steps = 0
+        self.last_keyframe = 0
+        self.previous_x = None
+        self.previous_y = None
+        self.file = open(path, "wb")
+        self.index_file = open(get_index_path(path), "wb")
+        self.file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(simulation),
+                simulation.speed,
+                simulation.width,
+                simulation.height,
+                len(simulation.rules),
+                keyframe_interval,
+                (seed or 0).to_bytes(16, "little"),
+                names,
+            )
+        )
+        self.record()
+
+    def record(self):
+        """
+        Record the current state of the simulation.
+        """
+        x = self.simulation.x.astype(np.int64)
+        y = self.simulation.y.astype(np.int64)
+        offset = self.file.tell()
+
+        is_keyframe = self.steps - self.last_keyframe >= self.keyframe_interval
+        if not is_keyframe and self.previous_x is not None:
+            delta_x = x - self.previous_x
+            delta_y = y - self.previous_y
+            fits = max(np.abs(delta_x).max(), np.abs(delta_y).max()) <= 127
+            is_keyframe = not fits
+        if self.previous_x is None or is_keyframe:
+            self.keyframe["x"] = x
+            self.keyframe["y"] = y
+            self.keyframe["species"] = self.simulation.species
+            self.file.write(self.keyframe.tobytes())
+            self.last_keyframe = self.steps
+        else:
+            self.delta["dx"] = delta_x
+            self.delta["dy"] = delta_y
+            self.delta["species"] = self.simulation.species
+            self.file.write(self.delta.tobytes())
+
+        self.index[self.buffered] = (offset, self.last_keyframe)
+        self.buffered += 1
+        if self.buffered == len(self.index):
+            self.flush()
+        self.previous_x = x
+        self.previous_y = y
+        self.steps += 1
+
+    def flush(self):
+        """
+        Write the buffered index entries, after the frames they point to.
+        """
+        self.file.flush()
+        self.index_file.write(self.index[: self.buffered].tobytes())
+        self.index_file.flush()
+        self.buffered = 0
+
+    def close(self):
+        """
+        Write the remaining index entries and close the files.
+        """
+        self.flush()
+        self.file.close()
+        self.index_file.close()
+
+
+def read_header(path):
+    """
+    Read the header of a replay file.
+
+    Args:
+        path (str): The path of the replay file.
+
+    Returns:
+        dict: The settings of the recorded simulation.
+
+    Raises:
+        ValueError: If the file is not a replay file of a supported version.
+    """
+    with open(path, "rb") as file:
+        data = file.read(HEADER.size)
+    magic, version = struct.unpack_from("<4sH", data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} replay file")
+    _, _, sprite_count, speed, width, height, species, interval, seed, names = HEADER.unpack_from(
+        data
+    )
+    return {
+        "sprite_count": sprite_count,
+        "speed": speed,
+        "width": width,
+        "height": height,
+        "species": species,
+        "names": tuple(names.rstrip(b"\0").decode("ascii").split(",")),
+        "keyframe_interval": interval,
+        "seed": int.from_bytes(seed, "little"),
+    }
+
+
+class ReplayReader:
+    """
+    A class for decoding any step of a replay file without loading the whole file.
+    """
+
+    def __init__(self, path):
+        """
+        Memory-map a replay file and its index.
+
+        Args:
+            path (str): The path of the replay file.
+        """
+        self.header = read_header(path)
+        sprite_count = self.header["sprite_count"]
+        self.keyframe_dtype = get_keyframe_dtype(sprite_count)
+        self.delta_dtype = get_delta_dtype(sprite_count)
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        self.index = np.memmap(get_index_path(path), dtype=INDEX_DTYPE, mode="r")
+
+    def __len__(self):
+        """
+        Get the number of recorded steps.
+
+        Returns:
+            int: The number of steps, including the initial state.
+        """
+        return len(self.index)
+
+    def get_step(self, step):
+        """
+        Decode the state of a step.
+
+        Args:
+            step (int): The step to decode, between 0 and `len(self) - 1`.
+
+        Returns:
+            tuple: The x and y coordinates and the species of every sprite, as NumPy arrays.
+        """
+        keyframe_step = int(self.index["keyframe"][step])
+        keyframe = self.read_frame(keyframe_step, self.keyframe_dtype)
+        x = keyframe["x"].astype(np.int64)
+        y = keyframe["y"].astype(np.int64)
+        species = keyframe["species"]
+        if step > keyframe_step:
+            # The movement frames after a keyframe are stored back to back
+            start = int(self.index["offset"][keyframe_step + 1])
+            deltas = self.data[start : start + (step - keyframe_step) * self.delta_dtype.itemsize]
+            deltas = deltas.view(self.delta_dtype)
+            x += deltas["dx"].sum(axis=0, dtype=np.int64)
+            y += deltas["dy"].sum(axis=0, dtype=np.int64)
+            species = deltas["species"][-1]
+        return x, y, np.array(species)
+
+    def read_frame(self, step, dtype):
+        """
+        Get a view of the frame of a step.
+
+        Args:
+            step (int): The step of the frame.
+            dtype (numpy.dtype): The type of the frame.
+
+        Returns:
+            numpy.void: The frame, backed by the memory map.
+        """
+        offset = int(self.index["offset"][step])
+        return self.data[offset : offset + dtype.itemsize].view(dtype)[0]
@@ -0,0 +1,81 @@
+"""
+This module defines the `Rules` class, which describes the species of a simulation and who eats whom.
+
+The relations are a dominance matrix: `dominance[a, b]` is True if species `a` eats species `b`.
+Cyclic rules for an odd number of species let every species eat exactly half of the others, like
+rock, paper, scissors or rock, paper, scissors, Spock, lizard.
+"""
+import numpy as np
+
+
+class Rules:
+    """
+    A class holding the species of a simulation and their dominance matrix.
+    """
+
+    def __init__(self, name, names, dominance):
+        """
+        Initialize a `Rules` object.
+
+        Args:
+            name (str): The name of the rules.
+            names (tuple): The name of every species, also the name of its sprite image.
+            dominance (numpy.ndarray): Square boolean matrix, `dominance[a, b]` is True if
+                species `a` eats species `b`.
+
+        Raises:
+            ValueError: If the matrix does not match the species, a species eats itself
+                or two species eat each other.
+        """
+        dominance = np.asarray(dominance, dtype=bool)
+        if dominance.shape != (len(names), len(names)):
+            raise ValueError(f"the dominance matrix of {len(names)} species must be square")
+        if dominance.diagonal().any():
+            raise ValueError("a species cannot eat itself")
+        if (dominance & dominance.T).any():
+            raise ValueError("two species cannot eat each other")
+        self.name = name
+        self.names = tuple(names)
+        self.dominance = dominance
+        # Species eaten by and species eating every species, as tuples to key the search indexes
+        self.prey = [tuple(np.flatnonzero(row).tolist()) for row in dominance]
+        self.hunters = [tuple(np.flatnonzero(column).tolist()) for column in dominance.T]
+
+    def __len__(self):
+        """
+        Get the number of species.
+
+        Returns:
+            int: The number of species.
+        """
+        return len(self.names)
+
+
+def create_cyclic_rules(name, names):
+    """
+    Create rules where species `i` eats species `i - 1`, `i - 3`, `i - 5` and so on, cyclically.
+
+    Args:
+        name (str): The name of the rules.
+        names (tuple): The name of every species, an odd number of them.
+
+    Returns:
+        Rules: The cyclic rules.
+
+    Raises:
+        ValueError: If the number of species is even, some pairs would eat each other.
+    """
+    count = len(names)
+    if count % 2 == 0:
+        raise ValueError("cyclic rules need an odd number of species")
+    dominance = np.zeros((count, count), dtype=bool)
+    for species in range(count):
+        dominance[species, (species - np.arange(1, count, 2)) % count] = True
+    return Rules(name, names, dominance)
+
+
+RULES = {
+    "rps": create_cyclic_rules("rps", ("rock", "paper", "scissors")),
+    "rpsls": create_cyclic_rules("rpsls", ("rock", "paper", "scissors", "spock", "lizard")),
+}
+DEFAULT_RULES = "rps"
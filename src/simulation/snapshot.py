@@ -0,0 +1,260 @@
+"""
+This module takes snapshots of the state of a simulation and restores them, to resume a match
+or to branch many continuations off one interesting state.
+
+A snapshot is a copy of the simulation arrays, the level of detail state and the cached targets of
+the sprites included, the step count, the state of the random generator and the settings of the match, including the rules. Restoring it copies the arrays back in place,
+so nothing holding a reference to the simulation or its arrays has to be rebuilt. Snapshots are
+saved as uncompressed `.npz` files, the arrays are written and read without any conversion.
+"""
+import json
+import os
+import numpy as np
+from src.simulation.engine import Simulation
+from src.simulation.rules import Rules
+
+
+class Snapshot:
+    """
+    A class holding a copy of the state of a simulation.
+    """
+
+    def __init__(
+        self,
+        seed,
+        speed,
+        group_size,
+        width,
+        height,
+        rules,
+        steps,
+        rng_state,
+        x,
+        y,
+        species,
+        distant,
+        velocity_x,
+        velocity_y,
+        prey_targets,
+        prey_ranges,
+        hunter_targets,
+        hunter_ranges,
+    ):
+        """
+        Initialize a `Snapshot` object.
+
+        Args:
+            seed (int): The seed the simulation was started with, None if unknown.
+            speed (int): The speed of the sprites.
+            group_size (int): The number of sprites in each contender group.
+            width (int): The width of the simulated world.
+            height (int): The height of the simulated world.
+            rules (Rules): The species and who eats whom.
+            steps (int): The number of steps simulated before the snapshot.
+            rng_state (dict): The state of the bit generator of the random generator.
+            x (numpy.ndarray): The x coordinate of every sprite.
+            y (numpy.ndarray): The y coordinate of every sprite.
+            species (numpy.ndarray): The species of every sprite.
+            distant (numpy.ndarray): Whether every sprite was far from any prey and hunter
+                at its last search.
+            velocity_x (numpy.ndarray): The x movement of every sprite caused by its last search.
+            velocity_y (numpy.ndarray): The y movement of every sprite caused by its last search.
+            prey_targets (numpy.ndarray): The cached prey of every sprite, -1 if it has none.
+            prey_ranges (numpy.ndarray): The distance of every cached prey when it was found.
+            hunter_targets (numpy.ndarray): The cached hunter of every sprite, -1 if it has none.
+            hunter_ranges (numpy.ndarray): The distance of every cached hunter when it was found.
+        """
+        self.seed = seed
+        self.speed = speed
+        self.group_size = group_size
+        self.width = width
+        self.height = height
+        self.rules = rules
+        self.steps = steps
+        self.rng_state = rng_state
+        self.x = x
+        self.y = y
+        self.species = species
+        self.distant = distant
+        self.velocity_x = velocity_x
+        self.velocity_y = velocity_y
+        self.prey_targets = prey_targets
+        self.prey_ranges = prey_ranges
+        self.hunter_targets = hunter_targets
+        self.hunter_ranges = hunter_ranges
+
+    def restore(self, simulation, rng=None):
+        """
+        Put a simulation back into the state of the snapshot.
+
+        Args:
+            simulation (Simulation): The simulation to restore, created with the same settings.
+            rng (numpy.random.Generator): The random generator of the continuation
+                (default: the generator in its saved state, to continue exactly like the original).
+
+        Raises:
+            ValueError: If the simulation does not have as many sprites as the snapshot.
+        """
+        if len(simulation) != len(self.species):
+            raise ValueError(
+                f"the snapshot has {len(self.species)} sprites, the simulation {len(simulation)}"
+            )
+        simulation.x[:] = self.x
+        simulation.y[:] = self.y
+        simulation.species[:] = self.species
+        simulation.distant[:] = self.distant
+        simulation.velocity_x[:] = self.velocity_x
+        simulation.velocity_y[:] = self.velocity_y
+        simulation.prey_cache.targets[:] = self.prey_targets
+        simulation.prey_cache.ranges[:] = self.prey_ranges
+        simulation.hunter_cache.targets[:] = self.hunter_targets
+        simulation.hunter_cache.ranges[:] = self.hunter_ranges
+        simulation.steps = self.steps
+        if rng is None:
+            simulation.rng.bit_generator.state = self.rng_state
+        else:
+            simulation.rng = rng
+        # The cached search indexes belong to the positions before the restore
+        simulation.nearest_indexes.clear()
+        simulation.conversions[:] = 0
+        simulation.prey_distances[:] = np.nan
+
+    def create_simulation(self, rng=None):
+        """
+        Create a new simulation in the state of the snapshot.
+
+        Args:
+            rng (numpy.random.Generator): The random generator of the continuation
+                (default: the generator in its saved state, to continue exactly like the original).
+
+        Returns:
+            Simulation: The simulation.
+        """
+        bit_generator = getattr(np.random, self.rng_state["bit_generator"])()
+        simulation = Simulation(
+            self.speed,
+            self.group_size,
+            np.random.Generator(bit_generator),
+            self.width,
+            self.height,
+            self.rules,
+        )
+        self.restore(simulation, rng)
+        return simulation
+
+    def save(self, path):
+        """
+        Save the snapshot to an `.npz` file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        settings = {
+            "seed": str(self.seed) if self.seed is not None else None,
+            "speed": self.speed,
+            "group_size": self.group_size,
+            "width": self.width,
+            "height": self.height,
+            "rules": self.rules.name,
+            "names": self.rules.names,
+            "steps": self.steps,
+            "rng_state": self.rng_state,
+        }
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                settings=np.array(json.dumps(settings)),
+                dominance=self.rules.dominance,
+                x=self.x,
+                y=self.y,
+                species=self.species,
+                distant=self.distant,
+                velocity_x=self.velocity_x,
+                velocity_y=self.velocity_y,
+                prey_targets=self.prey_targets,
+                prey_ranges=self.prey_ranges,
+                hunter_targets=self.hunter_targets,
+                hunter_ranges=self.hunter_ranges,
+            )
+
+
+def take_snapshot(simulation, seed=None):
+    """
+    Copy the state of a simulation.
+
+    Args:
+        simulation (Simulation): The simulation to copy.
+        seed (int): The seed the simulation was started with (default: None).
+
+    Returns:
+        Snapshot: The snapshot.
+    """
+    return Snapshot(
+        seed,
+        simulation.speed,
+        simulation.group_size,
+        simulation.width,
+        simulation.height,
+        simulation.rules,
+        simulation.steps,
+        simulation.rng.bit_generator.state,
+        simulation.x.copy(),
+        simulation.y.copy(),
+        simulation.species.copy(),
+        simulation.distant.copy(),
+        simulation.velocity_x.copy(),
+        simulation.velocity_y.copy(),
+        simulation.prey_cache.targets.copy(),
+        simulation.prey_cache.ranges.copy(),
+        simulation.hunter_cache.targets.copy(),
+        simulation.hunter_cache.ranges.copy(),
+    )
+
+
+def load_snapshot(path):
+    """
+    Load a snapshot saved with `Snapshot.save`.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Snapshot: The snapshot.
+    """
+    with np.load(path) as arrays:
+        settings = json.loads(str(arrays["settings"]))
+        return Snapshot(
+            int(settings["seed"]) if settings["seed"] is not None else None,
+            settings["speed"],
+            settings["group_size"],
+            settings["width"],
+            settings["height"],
+            Rules(settings["rules"], settings["names"], arrays["dominance"]),
+            settings["steps"],
+            settings["rng_state"],
+            arrays["x"],
+            arrays["y"],
+            arrays["species"],
+            arrays["distant"],
+            arrays["velocity_x"],
+            arrays["velocity_y"],
+            arrays["prey_targets"],
+            arrays["prey_ranges"],
+            arrays["hunter_targets"],
+            arrays["hunter_ranges"],
+        )
+
+
+def get_snapshot_path(snapshot_dir, seed, steps):
+    """
+    Get the path of the snapshot file of a match at a step.
+
+    Args:
+        snapshot_dir (str): The directory of the snapshot files.
+        seed (int): The seed of the match.
+        steps (int): The step the snapshot was taken at.
+
+    Returns:
+        str: The path of the snapshot file.
+    """
+    return os.path.join(snapshot_dir, f"snapshot-{seed}-{steps}.npz")
@@ -0,0 +1,156 @@
+"""
+This module defines the `SpatialHash` class, a uniform grid used as broad phase for short range
+sprite interactions.
+
+Sprites are bucketed into square cells at least as large as the interaction range, so every sprite
+a query point can touch lies in the 3x3 block of cells around it. The grid is rebuilt with a single
+sort of the cell keys, and queries binary search the sorted keys, so neither depends on the number
+of cells and large, sparsely populated worlds cost no more than small ones. Queries return
+candidate pairs as flat index arrays.
+
+The `CellLists` class is the same grid for sprites that move while it is in use: sprites are added
+one by one into a dictionary of cells, each into the 3x3 block of cells around its own, so a query
+of a single point only looks up one cell.
+"""
+import numpy as np
+
+# Column and row offsets of the 3x3 block of cells around a cell
+NEIGHBOUR_COLUMNS = np.repeat([-1, 0, 1], 3)
+NEIGHBOUR_ROWS = np.tile([-1, 0, 1], 3)
+
+
+class SpatialHash:
+    """
+    A class bucketing sprites into a uniform grid of square cells.
+    """
+
+    def __init__(self, cell_size, width, height):
+        """
+        Initialize an empty `SpatialHash` object.
+
+        Args:
+            cell_size (float): The side length of a cell, at least the interaction range.
+            width (int): The width of the covered area.
+            height (int): The height of the covered area.
+        """
+        self.cell_size = cell_size
+        # Points outside the area are clamped into the border cells, which keeps queries exact
+        self.columns = int(np.ceil(width / cell_size)) + 1
+        self.rows = int(np.ceil(height / cell_size)) + 1
+        self.indices = np.empty(0, dtype=int)
+        self.keys = np.empty(0, dtype=int)  # Sorted cell keys of the stored sprites
+
+    def get_cells(self, x, y):
+        """
+        Get the grid cell of points.
+
+        Args:
+            x (numpy.ndarray): The x coordinates of the points.
+            y (numpy.ndarray): The y coordinates of the points.
+
+        Returns:
+            tuple: The column and row of every point.
+        """
+        column = np.clip(x // self.cell_size, 0, self.columns - 1).astype(int)
+        row = np.clip(y // self.cell_size, 0, self.rows - 1).astype(int)
+        return column, row
+
+    def build(self, indices, x, y):
+        """
+        Bucket sprites into the grid, replacing the previous content.
+
+        Args:
+            indices (numpy.ndarray): The indices of the sprites to store.
+            x (numpy.ndarray): The x coordinates of the stored sprites.
+            y (numpy.ndarray): The y coordinates of the stored sprites.
+        """
+        column, row = self.get_cells(x, y)
+        keys = column * self.rows + row
+        order = np.argsort(keys, kind="stable")
+        self.indices = indices[order]
+        self.keys = keys[order]
+
+    def query_pairs(self, x, y):
+        """
+        Find the stored sprites in the cells around query points.
+
+        Args:
+            x (numpy.ndarray): The x coordinates of the query points.
+            y (numpy.ndarray): The y coordinates of the query points.
+
+        Returns:
+            tuple: Two arrays of equal length, the position of the query point in the input
+            and the index of a stored sprite near it, one entry per candidate pair.
+        """
+        column, row = self.get_cells(x, y)
+        # Every query point paired with each of its 9 neighbour cells
+        neighbour_columns = (column[:, None] + NEIGHBOUR_COLUMNS).ravel()
+        neighbour_rows = (row[:, None] + NEIGHBOUR_ROWS).ravel()
+        points = np.repeat(np.arange(len(column)), len(NEIGHBOUR_COLUMNS))
+        inside = (
+            (neighbour_columns >= 0)
+            & (neighbour_columns < self.columns)
+            & (neighbour_rows >= 0)
+            & (neighbour_rows < self.rows)
+        )
+        keys = neighbour_columns[inside] * self.rows + neighbour_rows[inside]
+        starts = np.searchsorted(self.keys, keys, side="left")
+        counts = np.searchsorted(self.keys, keys, side="right") - starts
+        # Expand every (point, cell) into one entry per sprite stored in the cell
+        first = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        queries = np.repeat(points[inside], counts)
+        candidates = self.indices[first + np.arange(counts.sum())]
+        return queries, candidates
+
+
+class CellLists:
+    """
+    A class bucketing sprites one by one into a grid of square cells.
+    """
+
+    def __init__(self, cell_size):
+        """
+        Initialize an empty `CellLists` object.
+
+        Args:
+            cell_size (float): The side length of a cell, at least the interaction range.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # Indices of the sprites in every occupied cell, by column and row
+
+    def __bool__(self):
+        """
+        Check whether any sprite is stored.
+
+        Returns:
+            bool: True if a sprite is stored.
+        """
+        return bool(self.cells)
+
+    def add(self, index, x, y):
+        """
+        Store a sprite.
+
+        Args:
+            index (int): The index of the sprite.
+            x (float): The x coordinate of the sprite.
+            y (float): The y coordinate of the sprite.
+        """
+        column, row = int(x // self.cell_size), int(y // self.cell_size)
+        for neighbour_column in (column - 1, column, column + 1):
+            for neighbour_row in (row - 1, row, row + 1):
+                self.cells.setdefault((neighbour_column, neighbour_row), []).append(index)
+
+    def query(self, x, y):
+        """
+        Find the stored sprites in the cells around a point.
+
+        Args:
+            x (float): The x coordinate of the point.
+            y (float): The y coordinate of the point.
+
+        Returns:
+            list: The indices of the sprites in the 3x3 block of cells around the point,
+            not to be modified.
+        """
+        return self.cells.get((int(x // self.cell_size), int(y // self.cell_size)), [])
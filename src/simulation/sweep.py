@@ -0,0 +1,318 @@
+"""
+This module runs parameter sweeps over speeds, group sizes and seeds, caching every result on disk.
+
+Results are stored in a SQLite database keyed by the match settings, the seed and the version of
+the simulation code, so a sweep only runs the matches missing from the cache. Results are committed
+as the chunks of matches finish, so an interrupted sweep resumes where it stopped, and changing the
+simulation code starts a fresh set of results instead of mixing in stale ones.
+"""
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from src.simulation.headless import run_match
+from src.simulation.rules import DEFAULT_RULES, RULES
+from src.simulation.tournament import get_chunk_size
+from src.utils import constants
+
+# Source files whose content decides the outcome of a match, relative to the `src` directory
+SIMULATION_FILES = (
+    "simulation/endgame.py",
+    "simulation/engine.py",
+    "simulation/headless.py",
+    "simulation/nearest.py",
+    "simulation/rules.py",
+    "simulation/spatial_hash.py",
+    "simulation/target_cache.py",
+    "utils/constants.py",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    speed INTEGER NOT NULL,
+    group_size INTEGER NOT NULL,
+    world_width INTEGER NOT NULL,
+    world_height INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    max_steps INTEGER NOT NULL,
+    endgame TEXT NOT NULL,
+    seed TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    winner TEXT,
+    steps INTEGER NOT NULL,
+    estimated_steps INTEGER,
+    counts TEXT NOT NULL,
+    PRIMARY KEY (
+        speed, group_size, world_width, world_height, rules, max_steps, endgame, seed, code_version
+    )
+)
+"""
+
+
+def get_code_version():
+    """
+    Get the version of the simulation code, a hash of the source files of the simulation.
+
+    Returns:
+        str: The first 12 hexadecimal digits of the hash.
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for name in SIMULATION_FILES:
+        with open(os.path.join(directory, name), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:12]
+
+
+class ResultCache:
+    """
+    A class for storing and looking up match results in a SQLite database.
+    """
+
+    def __init__(self, path, code_version=None):
+        """
+        Open the database, creating it if it does not exist.
+
+        Args:
+            path (str): The path of the database file.
+            code_version (str): The version the results are stored and looked up under
+                (default: the version of the current simulation code).
+        """
+        self.code_version = code_version or get_code_version()
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def get_seeds(self, config):
+        """
+        Get the seeds of the matches already cached for a configuration.
+
+        Args:
+            config (tuple): The speed, group size, world width, world height, rules name, step limit
+                and endgame mode.
+
+        Returns:
+            set: The cached seeds.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT seed FROM results
+            WHERE speed = ? AND group_size = ? AND world_width = ? AND world_height = ?
+            AND rules = ? AND max_steps = ? AND endgame = ? AND code_version = ?
+            """,
+            (*config, self.code_version),
+        )
+        return {int(seed) for (seed,) in rows}
+
+    def add(self, config, results):
+        """
+        Store the results of matches and commit them.
+        Matches stopped early in the "estimate" endgame mode also store their estimated length,
+        apart from the steps they were simulated for.
+
+        Args:
+            config (tuple): The speed, group size, world width, world height, rules name, step limit
+                and endgame mode.
+            results (list): The results of `run_match`.
+        """
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    *config,
+                    str(result["seed"]),
+                    self.code_version,
+                    result["winner"],
+                    result["steps"],
+                    result.get("estimated_steps"),
+                    json.dumps(result["counts"]),
+                )
+                for result in results
+            ],
+        )
+        self.connection.commit()
+
+    def get_summary(self, config):
+        """
+        Summarize the cached results of a configuration.
+
+        Args:
+            config (tuple): The speed, group size, world width, world height, rules name, step limit
+                and endgame mode.
+
+        Returns:
+            dict: The number of matches and unfinished matches, the win rate of every species,
+            the mean and longest simulated match length in steps and the mean estimated length
+            of the matches that have one, None if none has.
+        """
+        (mean_estimated_steps,) = self.connection.execute(
+            """
+            SELECT AVG(estimated_steps) FROM results
+            WHERE speed = ? AND group_size = ? AND world_width = ? AND world_height = ?
+            AND rules = ? AND max_steps = ? AND endgame = ? AND code_version = ?
+            """,
+            (*config, self.code_version),
+        ).fetchone()
+        rows = self.connection.execute(
+            """
+            SELECT winner, COUNT(*), AVG(steps), MAX(steps) FROM results
+            WHERE speed = ? AND group_size = ? AND world_width = ? AND world_height = ?
+            AND rules = ? AND max_steps = ? AND endgame = ? AND code_version = ?
+            GROUP BY winner
+            """,
+            (*config, self.code_version),
+        ).fetchall()
+        matches = sum(count for _, count, _, _ in rows)
+        wins = {winner: count for winner, count, _, _ in rows if winner is not None}
+        return {
+            "matches": matches,
+            "unfinished": matches - sum(wins.values()),
+            "win_rates": {
+                name: wins.get(name, 0) / matches if matches else 0.0
+                for name in RULES[config[4]].names
+            },
+            "mean_steps": (
+                sum(count * mean for _, count, mean, _ in rows) / matches if matches else 0.0
+            ),
+            "max_steps": max((longest for _, _, _, longest in rows), default=0),
+            "mean_estimated_steps": mean_estimated_steps,
+        }
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self.connection.close()
+
+
+def get_config(speed, group_size, world_width, world_height, rules, max_steps, endgame):
+    """
+    Get the cache key of a configuration.
+
+    Args:
+        speed (int): The speed of the sprites.
+        group_size (int): The number of sprites in each contender group.
+        world_width (int): The width of the simulated world.
+        world_height (int): The height of the simulated world.
+        rules (str): The name of the rules.
+        max_steps (int): The step limit of a match, None for no limit.
+        endgame (str): How decided matches are handled, one of `constants.ENDGAME_MODES`.
+
+    Returns:
+        tuple: The configuration, with a step limit of 0 for no limit.
+    """
+    return (speed, group_size, world_width, world_height, rules, max_steps or 0, endgame)
+
+
+def run_sweep_chunk(config, seeds):
+    """
+    Run the matches of one configuration in a worker process.
+
+    Args:
+        config (tuple): The speed, group size, world width, world height, rules name, step limit
+            and endgame mode.
+        seeds (list): The seed of every match.
+
+    Returns:
+        list: The result of every match.
+    """
+    speed, group_size, world_width, world_height, rules, max_steps, endgame = config
+    return [
+        run_match(
+            speed,
+            group_size,
+            seed,
+            max_steps or None,
+            world_width=world_width,
+            world_height=world_height,
+            rules=RULES[rules],
+            endgame=endgame,
+        )
+        for seed in seeds
+    ]
+
+
+def run_sweep(
+    cache_path,
+    speeds,
+    group_sizes,
+    seeds,
+    max_steps=None,
+    workers=None,
+    chunk_size=None,
+    world_width=constants.WORLD_WIDTH,
+    world_height=constants.WORLD_HEIGHT,
+    rules=DEFAULT_RULES,
+    endgame="play",
+    progress=None,
+):
+    """
+    Run every match of a grid of speeds, group sizes and seeds that is not cached yet.
+
+    Args:
+        cache_path (str): The path of the result database.
+        speeds (list): The speeds of the grid.
+        group_sizes (list): The group sizes of the grid.
+        seeds (list): The seeds every grid cell is played with.
+        max_steps (int): The step limit of a match (default: no limit).
+        workers (int): The number of worker processes (default: one per CPU).
+        chunk_size (int): The number of matches sent to a worker at once
+            (default: chosen by `get_chunk_size`).
+        world_width (int): The width of the simulated world (default: constants.WORLD_WIDTH).
+        world_height (int): The height of the simulated world (default: constants.WORLD_HEIGHT).
+        rules (str): The name of the rules (default: DEFAULT_RULES).
+        endgame (str): How to handle decided matches, one of
+            `constants.ENDGAME_MODES` (default: "play").
+        progress (callable): Called with the number of finished and missing matches after every
+            chunk (default: None).
+
+    Returns:
+        list: A row for every grid cell, its speed and group size and the summary of its results.
+    """
+    workers = workers or os.cpu_count()
+    cache = ResultCache(cache_path)
+    configs = [
+        get_config(speed, group_size, world_width, world_height, rules, max_steps, endgame)
+        for speed, group_size in itertools.product(speeds, group_sizes)
+    ]
+    missing_seeds = [sorted(set(seeds) - cache.get_seeds(config)) for config in configs]
+    chunk_size = chunk_size or get_chunk_size(sum(map(len, missing_seeds)), workers)
+    chunks = []
+    for config, missing in zip(configs, missing_seeds):
+        chunks += [
+            (config, missing[start : start + chunk_size])
+            for start in range(0, len(missing), chunk_size)
+        ]
+    missing_matches = sum(len(chunk_seeds) for _, chunk_seeds in chunks)
+
+    finished = 0
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = {}
+        chunks = iter(chunks)
+        while True:
+            # Keep every worker busy without queueing the whole sweep up front
+            for config, chunk_seeds in itertools.islice(chunks, workers * 2 - len(pending)):
+                pending[executor.submit(run_sweep_chunk, config, chunk_seeds)] = config
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results = future.result()
+                cache.add(pending.pop(future), results)
+                finished += len(results)
+                if progress is not None:
+                    progress(finished, missing_matches)
+        executor.shutdown()
+    finally:
+        # On an interruption, the finished chunks are already committed to the cache
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    rows = [
+        {"speed": config[0], "group_size": config[1], **cache.get_summary(config)}
+        for config in configs
+    ]
+    cache.close()
+    return rows
@@ -0,0 +1,136 @@
+"""
+This module defines the `TargetCache` class, which remembers the closest target of every sprite
+so that it is not searched for again in every step.
+
+The closest prey or hunter of a sprite rarely changes from one step to the next. A cached target is
+kept while it is still a target of the sprite, it was not eaten and the sprite was not eaten either,
+and while it is at most `constants.TARGET_TOLERANCE` pixels farther away than when it was found.
+Every sprite searches again every `refresh` steps anyway, sprites take turns by their index, since a
+target farther away than a new one is only noticed then. In validation mode the kept targets are
+compared with an exact search, to measure how often and how much farther the cache's picks are.
+"""
+import numpy as np
+from src.utils import constants
+
+
+class TargetCache:
+    """
+    A class for keeping the closest target of every sprite between steps.
+    """
+
+    def __init__(self, count):
+        """
+        Initialize an empty `TargetCache` object.
+
+        Args:
+            count (int): The number of sprites.
+        """
+        self.targets = np.full(count, -1)  # Cached target of every sprite, -1 if it has none
+        self.ranges = np.full(count, np.inf)  # Distance of the target when it was found
+        # Kept targets, searches, and in validation mode the number of kept targets that were
+        # not the closest one and by how many pixels they were farther away in total
+        self.stats = {"hits": 0, "searches": 0, "checked": 0, "wrong": 0, "extra_distance": 0.0}
+
+    def find(
+        self, simulation, movers, target_species, refresh, max_distance=np.inf, validate=False
+    ):
+        """
+        Get the closest target of every moving sprite, searching only for the sprites without
+        a valid cached target.
+
+        Args:
+            simulation (Simulation): The simulation of the sprites.
+            movers (numpy.ndarray): The indices of the searching sprites.
+            target_species (tuple): The species to search for.
+            refresh (int): The steps after which a sprite searches again in any case.
+            max_distance (float): Targets at least this far away are ignored (default: no limit).
+            validate (bool): Whether to compare the kept targets with an exact search
+                (default: False).
+
+        Returns:
+            numpy.ndarray: The index of the target of every mover, -1 if there is none.
+        """
+        targets = self.targets[movers]
+        candidates = np.flatnonzero((targets >= 0) & ((movers + simulation.steps) % refresh != 0))
+        is_target_species = np.zeros(len(simulation.rules), dtype=bool)
+        is_target_species[list(target_species)] = True
+        distance_x, distance_y = simulation.get_distances(movers[candidates], targets[candidates])
+        valid = is_target_species[simulation.species[targets[candidates]]] & (
+            np.hypot(distance_x, distance_y)
+            <= self.ranges[movers[candidates]] + constants.TARGET_TOLERANCE
+        )
+        kept = np.zeros(len(movers), dtype=bool)
+        kept[candidates[valid]] = True
+
+        searched = movers[~kept]
+        found = simulation.find_closest(searched, target_species, max_distance)
+        targets[~kept] = found
+        self.targets[searched] = found
+        self.ranges[searched] = np.inf
+        has_target = found >= 0
+        self.ranges[searched[has_target]] = np.hypot(
+            *simulation.get_distances(searched[has_target], found[has_target])
+        )
+        self.stats["hits"] += int(kept.sum())
+        self.stats["searches"] += len(searched)
+        if validate:
+            self.validate(simulation, movers[kept], targets[kept], target_species, max_distance)
+        return targets
+
+    def validate(self, simulation, movers, targets, target_species, max_distance):
+        """
+        Compare kept targets with the closest ones.
+
+        Args:
+            simulation (Simulation): The simulation of the sprites.
+            movers (numpy.ndarray): The indices of the sprites that kept their target.
+            targets (numpy.ndarray): The kept target of every mover.
+            target_species (tuple): The species of the targets.
+            max_distance (float): Targets at least this far away are ignored.
+        """
+        closest = simulation.find_closest(movers, target_species, max_distance)
+        wrong = closest != targets
+        self.stats["checked"] += len(movers)
+        self.stats["wrong"] += int(wrong.sum())
+        if wrong.any():
+            kept_distance = np.hypot(*simulation.get_distances(movers[wrong], targets[wrong]))
+            found = closest[wrong] >= 0
+            closest_distance = np.full(len(kept_distance), max_distance)
+            closest_distance[found] = np.hypot(
+                *simulation.get_distances(movers[wrong][found], closest[wrong][found])
+            )
+            self.stats["extra_distance"] += float((kept_distance - closest_distance).sum())
+
+    def forget(self, sprites):
+        """
+        Forget the cached targets of sprites that changed species, and every cached target
+        that is one of them.
+
+        Args:
+            sprites (numpy.ndarray): The indices of the sprites.
+        """
+        stale = np.isin(self.targets, sprites)
+        stale[sprites] = True
+        self.targets[stale] = -1
+        self.ranges[stale] = np.inf
+
+
+def get_target_stats(caches):
+    """
+    Get the combined statistics of target caches.
+
+    Args:
+        caches (list): The `TargetCache` objects.
+
+    Returns:
+        dict: The fraction of targets taken from the caches, and in validation mode the fraction
+            of the checked targets that were not the closest one and how many pixels farther
+            away they were on average.
+    """
+    stats = {key: sum(cache.stats[key] for cache in caches) for key in caches[0].stats}
+    lookups = stats["hits"] + stats["searches"]
+    return {
+        "hits": stats["hits"] / lookups if lookups > 0 else 0.0,
+        "wrong": stats["wrong"] / stats["checked"] if stats["checked"] > 0 else 0.0,
+        "extra_distance": stats["extra_distance"] / stats["wrong"] if stats["wrong"] > 0 else 0.0,
+    }
@@ -0,0 +1,182 @@
+"""
+This module samples the population of a simulation over time and streams the samples to a CSV file.
+
+Every sample holds the step, the sprite count of every species, the sprites every species gained
+by eating since the previous sample and the mean distance of every species to its closest prey.
+The `PopulationSampler` keeps only the latest samples in a fixed-size ring buffer, for live plots,
+and hands full batches of rows to a `TimeSeriesWriter`, which writes them on a background thread.
+Memory stays bounded however long the match runs.
+"""
+import queue
+import threading
+import numpy as np
+
+
+def get_columns(names):
+    """
+    Get the column names of the samples of a simulation.
+
+    Args:
+        names (tuple): The name of every species.
+
+    Returns:
+        list: The name of every column.
+    """
+    return (
+        ["step"]
+        + [f"count_{name}" for name in names]
+        + [f"converted_{name}" for name in names]
+        + [f"prey_distance_{name}" for name in names]
+    )
+
+
+class TimeSeriesWriter:
+    """
+    A class for writing batches of samples to a CSV file on a background thread.
+    """
+
+    def __init__(self, path, columns, max_batches=64):
+        """
+        Open the CSV file, write its header and start the writer thread.
+
+        Args:
+            path (str): The path of the CSV file.
+            columns (list): The name of every column.
+            max_batches (int): The number of batches waiting to be written before `write` blocks
+                (default: 64).
+        """
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.file.write(",".join(columns) + "\n")
+        # Counts are whole numbers, only the distances need decimals
+        count_columns = 1 + 2 * ((len(columns) - 1) // 3)
+        self.formats = ["%d"] * count_columns + ["%.3f"] * (len(columns) - count_columns)
+        self.batches = queue.Queue(maxsize=max_batches)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def write(self, rows):
+        """
+        Queue a batch of rows to be written.
+
+        Args:
+            rows (numpy.ndarray): The rows, one sample per row, owned by the writer from now on.
+        """
+        self.batches.put(rows)
+
+    def run(self):
+        """
+        Write the queued batches until the writer is closed.
+        """
+        while True:
+            rows = self.batches.get()
+            if rows is None:
+                break
+            np.savetxt(self.file, rows, fmt=self.formats, delimiter=",")
+
+    def close(self):
+        """
+        Write the queued batches, stop the thread and close the file.
+        """
+        self.batches.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+class PopulationSampler:
+    """
+    A class for sampling the population of a simulation every few steps.
+    """
+
+    def __init__(self, simulation, path=None, interval=1, history=500, batch_size=256):
+        """
+        Initialize a `PopulationSampler` object and take the first sample.
+
+        Args:
+            simulation (Simulation): The sampled simulation.
+            path (str): The path of the CSV file to stream the samples to (default: no file).
+            interval (int): The number of steps between two samples (default: 1).
+            history (int): The number of samples kept in memory (default: 500).
+            batch_size (int): The number of samples handed to the writer at once (default: 256).
+        """
+        self.simulation = simulation
+        self.interval = interval
+        self.species_count = len(simulation.rules)
+        self.columns = get_columns(simulation.rules.names)
+        self.history = np.full((history, len(self.columns)), np.nan)
+        self.samples = 0  # Number of samples taken, the next one goes to `samples % history`
+        self.converted = np.zeros(self.species_count, dtype=int)  # Since the last sample
+        self.batch = np.empty((batch_size, len(self.columns)))
+        self.batched = 0
+        self.writer = None
+        if path is not None:
+            self.writer = TimeSeriesWriter(path, self.columns)
+        self.take_sample()
+
+    def sample(self):
+        """
+        Add the conversions of the last step and take a sample if it is due.
+        Called after every step of the simulation.
+        """
+        self.converted += self.simulation.conversions
+        if self.simulation.steps % self.interval == 0:
+            self.take_sample()
+
+    def take_sample(self):
+        """
+        Take a sample of the current state of the simulation.
+        """
+        row = self.history[self.samples % len(self.history)]
+        count = self.species_count
+        row[0] = self.simulation.steps
+        row[1 : 1 + count] = self.simulation.get_counts()
+        row[1 + count : 1 + 2 * count] = self.converted
+        row[1 + 2 * count :] = self.simulation.prey_distances
+        self.converted[:] = 0
+        self.samples += 1
+
+        if self.writer is not None:
+            self.batch[self.batched] = row
+            self.batched += 1
+            if self.batched == len(self.batch):
+                self.flush()
+
+    def get_history(self):
+        """
+        Get the samples kept in memory, oldest first.
+
+        Returns:
+            numpy.ndarray: One row per sample, in the order of `self.columns`.
+        """
+        if self.samples <= len(self.history):
+            return self.history[: self.samples]
+        return np.roll(self.history, -(self.samples % len(self.history)), axis=0)
+
+    def get_counts(self):
+        """
+        Get the sprite counts of the samples kept in memory, oldest first.
+
+        Returns:
+            numpy.ndarray: The count of every species, one row per sample.
+        """
+        return self.get_history()[:, 1 : 1 + self.species_count]
+
+    def flush(self):
+        """
+        Hand the batched samples to the writer.
+        """
+        if self.batched > 0:
+            self.writer.write(self.batch[: self.batched].copy())
+            self.batched = 0
+
+    def close(self):
+        """
+        Sample the final state if it was not sampled yet, write the remaining samples and close
+        the file, if the samples are streamed to one.
+        """
+        last_step = self.history[(self.samples - 1) % len(self.history), 0]
+        if last_step != self.simulation.steps:
+            self.take_sample()
+        if self.writer is not None:
+            self.flush()
+            self.writer.close()
+            self.writer = None
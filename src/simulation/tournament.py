@@ -0,0 +1,240 @@
+"""
+This module runs tournaments of many independent headless matches on a process pool.
+
+Every match gets its own random stream spawned from the tournament seed, so the outcome of a match
+does not depend on which worker runs it. Matches are submitted to the workers in chunks, and only a
+bounded number of chunks is in flight at once, so results are aggregated while they stream in.
+Chunks are small enough by default that even a short tournament is spread over every worker.
+"""
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from src.simulation.headless import create_seed, run_match
+from src.simulation.rules import DEFAULT_RULES, RULES
+from src.utils import constants
+
+# z-score of the 95% confidence intervals
+CONFIDENCE_Z = 1.96
+# Chunks per worker aimed for and most matches in a chunk, when the chunk size is not given
+CHUNKS_PER_WORKER = 4
+MAX_CHUNK_SIZE = 10
+
+
+def run_chunk(speed, group_size, seeds, max_steps, world_width, world_height, rules, endgame):
+    """
+    Run a chunk of matches in a worker process.
+
+    Args:
+        speed (int): The speed of the sprites.
+        group_size (int): The number of sprites in each contender group.
+        seeds (list): The `numpy.random.SeedSequence` of every match in the chunk.
+        max_steps (int): The step limit of a match.
+        world_width (int): The width of the simulated world.
+        world_height (int): The height of the simulated world.
+        rules (Rules): The species and who eats whom.
+        endgame (str): How to handle decided matches, one of `constants.ENDGAME_MODES`.
+
+    Returns:
+        list: A (winner, steps) tuple for every match, the winner is None for unfinished matches.
+    """
+    results = []
+    for seed in seeds:
+        result = run_match(
+            speed,
+            group_size,
+            seed,
+            max_steps,
+            world_width=world_width,
+            world_height=world_height,
+            rules=rules,
+            endgame=endgame,
+        )
+        results.append((result["winner"], result["steps"]))
+    return results
+
+
+class Tally:
+    """
+    A class aggregating match results as they arrive.
+    """
+
+    def __init__(self, names):
+        """
+        Initialize an empty `Tally` object.
+
+        Args:
+            names (tuple): The name of every species.
+        """
+        self.wins = dict.fromkeys(names, 0)
+        self.unfinished = 0
+        self.matches = 0
+        self.steps = 0
+
+    def add(self, winner, steps):
+        """
+        Add the result of one match.
+
+        Args:
+            winner (str): The winning group, None if the match hit the step limit.
+            steps (int): The number of simulated steps.
+        """
+        if winner is None:
+            self.unfinished += 1
+        else:
+            self.wins[winner] += 1
+        self.matches += 1
+        self.steps += steps
+
+    def get_probabilities(self):
+        """
+        Get the winning probability of every group with its 95% Wilson score interval.
+
+        Returns:
+            dict: A (probability, lower bound, upper bound) tuple for every group.
+        """
+        return {
+            name: wilson_interval(wins, self.matches) for name, wins in self.wins.items()
+        }
+
+
+def wilson_interval(successes, trials):
+    """
+    Calculate the Wilson score interval of a binomial proportion.
+
+    Args:
+        successes (int): The number of successes.
+        trials (int): The number of trials.
+
+    Returns:
+        tuple: The observed proportion and the lower and upper bounds of its confidence interval.
+    """
+    if trials == 0:
+        return (0.0, 0.0, 1.0)
+    proportion = successes / trials
+    z_squared = CONFIDENCE_Z**2
+    center = (proportion + z_squared / (2 * trials)) / (1 + z_squared / trials)
+    margin = (
+        CONFIDENCE_Z
+        / (1 + z_squared / trials)
+        * math.sqrt(proportion * (1 - proportion) / trials + z_squared / (4 * trials**2))
+    )
+    return (proportion, max(0.0, center - margin), min(1.0, center + margin))
+
+
+def get_chunk_size(matches, workers):
+    """
+    Get the number of matches to send to a worker at once, so that every worker gets a few chunks
+    to balance the load but large runs do not send a chunk for every match.
+
+    Args:
+        matches (int): The number of matches to run.
+        workers (int): The number of worker processes.
+
+    Returns:
+        int: The chunk size, between 1 and `MAX_CHUNK_SIZE`.
+    """
+    return max(1, min(MAX_CHUNK_SIZE, math.ceil(matches / (workers * CHUNKS_PER_WORKER))))
+
+
+def run_tournament(
+    speed,
+    group_size,
+    matches,
+    seed=None,
+    max_steps=None,
+    workers=None,
+    chunk_size=None,
+    world_width=constants.WORLD_WIDTH,
+    world_height=constants.WORLD_HEIGHT,
+    rules=None,
+    endgame="play",
+):
+    """
+    Run independent matches on a process pool and aggregate their results.
+
+    Args:
+        speed (int): The speed of the sprites.
+        group_size (int): The number of sprites in each contender group.
+        matches (int): The number of matches to run.
+        seed (int): The seed every match's random stream is spawned from
+            (default: a fresh seed, reported in the results).
+        max_steps (int): The step limit of a match (default: no limit).
+        workers (int): The number of worker processes (default: one per CPU).
+        chunk_size (int): The number of matches sent to a worker at once
+            (default: chosen by `get_chunk_size`).
+        world_width (int): The width of the simulated world (default: constants.WORLD_WIDTH).
+        world_height (int): The height of the simulated world (default: constants.WORLD_HEIGHT).
+        rules (Rules): The species and who eats whom (default: rock, paper, scissors).
+        endgame (str): How to handle decided matches, one of `constants.ENDGAME_MODES`.
+            Without a step limit, stopping them early does not change the winning probabilities,
+            with one, matches decided before the limit count as won (default: "play").
+
+    Returns:
+        dict: The winning probabilities with confidence intervals and the throughput statistics.
+    """
+    workers = workers or os.cpu_count()
+    rules = rules if rules is not None else RULES[DEFAULT_RULES]
+    if seed is None:
+        seed = create_seed()
+    seeds = np.random.SeedSequence(seed).spawn(matches)
+    chunk_size = chunk_size or get_chunk_size(matches, workers)
+    chunks = [seeds[start : start + chunk_size] for start in range(0, matches, chunk_size)]
+    tally = Tally(rules.names)
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            # Keep every worker busy without queueing the whole tournament up front
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                add_results(tally, done)
+            pending.add(
+                executor.submit(
+                    run_chunk,
+                    speed,
+                    group_size,
+                    chunk,
+                    max_steps,
+                    world_width,
+                    world_height,
+                    rules,
+                    endgame,
+                )
+            )
+        add_results(tally, wait(pending).done)
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "speed": speed,
+        "group_size": group_size,
+        "world_size": [world_width, world_height],
+        "rules": rules.name,
+        "endgame": endgame,
+        "seed": seed,
+        "matches": tally.matches,
+        "unfinished": tally.unfinished,
+        "probabilities": {
+            name: {"p": p, "ci_low": low, "ci_high": high}
+            for name, (p, low, high) in tally.get_probabilities().items()
+        },
+        "workers": workers,
+        "seconds": elapsed,
+        "matches_per_second": tally.matches / elapsed,
+        "steps_per_second": tally.steps / elapsed,
+    }
+
+
+def add_results(tally, futures):
+    """
+    Add the results of finished chunks to the tally.
+
+    Args:
+        tally (Tally): The tally to update.
+        futures (set): The finished futures of `run_chunk` calls.
+    """
+    for future in futures:
+        for winner, steps in future.result():
+            tally.add(winner, steps)
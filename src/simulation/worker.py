@@ -0,0 +1,195 @@
+"""
+This module runs a simulation on a background thread, so that stepping it and rendering it
+do not wait for each other.
+
+The worker steps the simulation in its own arrays and, after every step, copies the state into
+the back one of two `StateBuffer` objects. The render thread swaps the buffers at the start of a
+frame, when a newer state is ready, and then draws the front buffer, which the worker never writes.
+Only the NumPy work of a step releases the global interpreter lock, settling the sprites of a group
+runs in Python and holds it. The interpreter still switches threads every few milliseconds, so the
+render thread keeps handling events and drawing while a slow step runs, only less often, and a slow
+frame does not hold the simulation back.
+"""
+import threading
+import time
+import numpy as np
+
+
+class StateBuffer:
+    """
+    A class holding a copy of the state of a simulation that is needed to render it.
+    """
+
+    def __init__(self, simulation):
+        """
+        Initialize a `StateBuffer` object with the current state of a simulation.
+
+        Args:
+            simulation (Simulation): The simulation to copy.
+        """
+        self.rules = simulation.rules
+        self.x = simulation.x.copy()
+        self.y = simulation.y.copy()
+        self.species = simulation.species.copy()
+        self.steps = simulation.steps
+
+    def __len__(self):
+        """
+        Get the number of sprites in the buffer.
+
+        Returns:
+            int: The number of sprites.
+        """
+        return len(self.species)
+
+    def copy_from(self, simulation):
+        """
+        Overwrite the buffer with the current state of a simulation.
+
+        Args:
+            simulation (Simulation): The simulation to copy.
+        """
+        np.copyto(self.x, simulation.x)
+        np.copyto(self.y, simulation.y)
+        np.copyto(self.species, simulation.species)
+        self.steps = simulation.steps
+
+    def get_counts(self):
+        """
+        Get the number of sprites in each group.
+
+        Returns:
+            numpy.ndarray: The sprite count of every species, indexed by species.
+        """
+        return np.bincount(self.species, minlength=len(self.rules))
+
+    def get_winner(self):
+        """
+        Get the species that converted every other sprite.
+
+        Returns:
+            int: The index of the winning species, or None if the game is not over yet.
+        """
+        counts = self.get_counts()
+        if counts.max() == len(self):
+            return int(counts.argmax())
+        return None
+
+
+class SimulationWorker:
+    """
+    A class for stepping a simulation on a background thread and handing its state over
+    to the render thread through two state buffers.
+    """
+
+    def __init__(self, simulation, on_step=None):
+        """
+        Initialize a `SimulationWorker` object and start its thread.
+
+        Args:
+            simulation (Simulation): The simulation to step. Only the worker touches it while
+                it runs, other threads have to pause the worker first.
+            on_step (callable): Called on the worker thread after every step, before the
+                state is published, while the simulation is not paused (default: None).
+        """
+        self.simulation = simulation
+        self.on_step = on_step
+        self.front = StateBuffer(simulation)  # Drawn by the render thread
+        self.back = StateBuffer(simulation)  # Written by the worker
+        self.back_ready = False  # Whether the back buffer holds a newer state than the front one
+        self.lock = threading.Lock()  # Guards the buffers and the requested steps
+        self.wakeup = threading.Condition(self.lock)
+        self.step_lock = threading.Lock()  # Held while stepping, taken by `pause`
+        self.requested = 0  # Steps requested and not run yet
+        self.step_ms = 0.0  # Smoothed duration of a step in milliseconds
+        self.is_running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def request(self, steps):
+        """
+        Request more steps from the worker.
+
+        Args:
+            steps (int): The number of steps to add.
+        """
+        with self.lock:
+            self.requested += steps
+            self.wakeup.notify()
+
+    def get_requested(self):
+        """
+        Get the number of requested steps the worker has not run yet.
+
+        Returns:
+            int: The number of steps.
+        """
+        with self.lock:
+            return self.requested
+
+    def swap(self):
+        """
+        Make the latest finished step the front buffer, if there is a newer one.
+        Called by the render thread at the start of a frame.
+
+        Returns:
+            bool: Whether the front buffer changed.
+        """
+        with self.lock:
+            if not self.back_ready:
+                return False
+            self.front, self.back = self.back, self.front
+            self.back_ready = False
+            return True
+
+    def pause(self):
+        """
+        Get a lock that keeps the worker from stepping while it is held, to change the simulation
+        from another thread. Call `publish` before releasing it if the simulation was changed.
+
+        Returns:
+            threading.Lock: The lock to hold, as a context manager.
+        """
+        return self.step_lock
+
+    def publish(self):
+        """
+        Copy the state of the simulation into the back buffer and mark it ready.
+        """
+        with self.lock:
+            self.back.copy_from(self.simulation)
+            self.back_ready = True
+
+    def run(self):
+        """
+        Run the requested steps until the worker is stopped. Steps requested after a group has
+        won are dropped, the render thread sees the winner in the last published state.
+        """
+        while True:
+            with self.lock:
+                while self.is_running and self.requested == 0:
+                    self.wakeup.wait()
+                if not self.is_running:
+                    return
+            with self.step_lock:
+                if self.simulation.get_winner() is not None:
+                    with self.lock:
+                        self.requested = 0
+                    continue
+                start = time.perf_counter_ns()
+                self.simulation.step()
+                self.step_ms += ((time.perf_counter_ns() - start) / 1e6 - self.step_ms) * 0.1
+                if self.on_step is not None:
+                    self.on_step()
+                with self.lock:
+                    self.requested = max(self.requested - 1, 0)
+                self.publish()
+
+    def stop(self):
+        """
+        Stop the thread after the step it is running, if any.
+        """
+        with self.lock:
+            self.is_running = False
+            self.wakeup.notify()
+        self.thread.join()
@@ -0,0 +1,133 @@
+"""
+This module defines the `SpriteCache` class, a process-wide cache of the sprite images.
+Species without an image file get a plain circle in the color of the species.
+
+Every sprite image is loaded, converted to the display format and scaled once, and the same surface
+is handed out to every sprite of that type. The cache is emptied when the sprite size or the
+display resolution changes, so surfaces never outlive the display format they were converted to.
+Images are taken from the asset bundle when it was built, already scaled for the usual sprite size.
+"""
+import os
+import zlib
+import pygame
+from src.utils import constants
+from src.utils.bundle import asset_bundle
+
+
+class SpriteCache:
+    """
+    A class for loading each sprite image once and sharing it between all sprites.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty `SpriteCache` object.
+        """
+        self.images = {}  # Scaled surface of every (sprite type, size)
+        self.resolution = None  # Display resolution the cached surfaces were converted for
+
+    def get_image(self, image, size):
+        """
+        Get the scaled surface of a sprite type, loading it on first use.
+
+        Args:
+            image (str): The type of sprite (rock, paper, or scissors).
+            size (int): The side length of the sprite in pixels.
+
+        Returns:
+            pygame.Surface: The shared surface, callers must not draw on it.
+        """
+        self.check_resolution()
+        key = (image, size)
+        if key not in self.images:
+            self.images[key] = self.load_image(image, size)
+        return self.images[key]
+
+    def load_image(self, image, size):
+        """
+        Load, convert and scale a sprite image.
+
+        Args:
+            image (str): The type of sprite (rock, paper, or scissors).
+            size (int): The side length of the sprite in pixels.
+
+        Returns:
+            pygame.Surface: The scaled sprite image.
+        """
+        path = f"{constants.SPRITE_DIR}/{image}.png"
+        surface = asset_bundle.get_image(path, (size, size))
+        if surface is None:
+            surface = asset_bundle.get_image(path)
+            if surface is None:
+                if not os.path.exists(path):
+                    return create_fallback_image(image, size)
+                surface = pygame.image.load(path)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        surface = pygame.transform.scale(surface, (size, size))
+        surface.set_colorkey((255, 255, 255))
+        return surface
+
+    def check_resolution(self):
+        """
+        Empty the cache if the display resolution changed since the surfaces were converted.
+        """
+        display = pygame.display.get_surface()
+        resolution = display.get_size() if display is not None else None
+        if resolution != self.resolution:
+            self.clear()
+            self.resolution = resolution
+
+    def evict(self, size):
+        """
+        Remove the surfaces of a sprite size that is not used anymore.
+
+        Args:
+            size (int): The sprite size to remove.
+        """
+        for key in [key for key in self.images if key[1] == size]:
+            del self.images[key]
+
+    def clear(self):
+        """
+        Remove every cached surface, they are reloaded on next use.
+        """
+        self.images.clear()
+
+
+def get_species_color(name):
+    """
+    Get the color of a species, used for its score bar and for the sprites drawn without an image.
+
+    Args:
+        name (str): The name of the species.
+
+    Returns:
+        tuple: The RGB color of the species.
+    """
+    if name in constants.SPECIES_COLORS:
+        return constants.SPECIES_COLORS[name]
+    return constants.FALLBACK_COLORS[zlib.crc32(name.encode()) % len(constants.FALLBACK_COLORS)]
+
+
+def create_fallback_image(image, size):
+    """
+    Draw the image of a species that has no image file, a circle in the color of the species.
+
+    Args:
+        image (str): The name of the species.
+        size (int): The side length of the sprite in pixels.
+
+    Returns:
+        pygame.Surface: The sprite image.
+    """
+    surface = pygame.Surface((size, size))
+    surface.fill((255, 255, 255))
+    radius = size / 2
+    pygame.draw.circle(surface, get_species_color(image), (radius, radius), radius)
+    pygame.draw.circle(surface, constants.TEXTCOLOR, (radius, radius), radius, 1)
+    surface.set_colorkey((255, 255, 255))
+    return surface
+
+
+sprite_cache = SpriteCache()
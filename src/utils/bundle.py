@@ -0,0 +1,196 @@
+"""
+This module builds the asset bundle and reads assets from it.
+
+The bundle packs everything the game loads at startup into one file: the pixels of every sprite
+image, both at their original size and already scaled to the sprite size, the window icon scaled
+to the icon size, and the font file. Pixels are stored as raw RGBA values, so loading an image
+is a copy instead of decoding and scaling a PNG file, and the whole bundle is read at once.
+
+The file starts with a header holding the magic, the version and the length of a JSON table,
+followed by the table and the data. The table maps the key of every asset to its offset, length
+and pixel size in the data, and lists the modification time of every source file. A bundle older
+than any of its sources is ignored, and the assets are loaded from their files as before.
+
+Build the bundle with `python -m src.utils.bundle`.
+"""
+import io
+import json
+import os
+import struct
+import pygame
+from src.utils import constants
+
+MAGIC = b"RPSA"
+VERSION = 1
+# Magic, version, length of the JSON table
+HEADER = struct.Struct("<4sHI")
+
+
+class AssetBundle:
+    """
+    A class for reading assets from the bundle file, which is read on first use.
+    """
+
+    def __init__(self, path=constants.ASSET_BUNDLE):
+        """
+        Initialize an `AssetBundle` object.
+
+        Args:
+            path (str): The path of the bundle file (default: constants.ASSET_BUNDLE).
+        """
+        self.path = path
+        self.entries = None  # Offset, length and size of every asset, empty if there is no bundle
+        self.content = None  # Content of the bundle file
+        self.data_offset = 0  # Position of the data of the first asset in the content
+
+    def load(self):
+        """
+        Read the bundle file, unless it was read already. A missing, outdated or unreadable
+        bundle leaves the bundle empty.
+        """
+        if self.entries is not None:
+            return
+        self.entries = {}
+        try:
+            with open(self.path, "rb") as file:
+                content = file.read()
+            magic, version, table_length = HEADER.unpack_from(content)
+            if magic != MAGIC or version != VERSION:
+                return
+            table = json.loads(content[HEADER.size : HEADER.size + table_length])
+            for source, modified in table["sources"].items():
+                if os.path.getmtime(source) > modified:
+                    return
+        except (OSError, ValueError, struct.error):
+            return
+        self.content = content
+        self.data_offset = HEADER.size + table_length
+        self.entries = table["entries"]
+
+    def get_image(self, path, size=None):
+        """
+        Get an image from the bundle.
+
+        Args:
+            path (str): The path of the image file.
+            size (tuple): The width and height of the image (default: its original size).
+
+        Returns:
+            pygame.Surface: A new surface with the image, or None if it is not in the bundle.
+        """
+        entry = self.get_entry(get_image_key(path, size))
+        if entry is None:
+            return None
+        offset, length, image_size = entry
+        return pygame.image.frombytes(
+            self.content[offset : offset + length], tuple(image_size), "RGBA"
+        )
+
+    def open(self, path):
+        """
+        Open a file from the bundle.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            io.BytesIO: A new file object with the content, or None if it is not in the bundle.
+        """
+        entry = self.get_entry(path)
+        if entry is None:
+            return None
+        offset, length, _ = entry
+        return io.BytesIO(self.content[offset : offset + length])
+
+    def get_entry(self, key):
+        """
+        Get the location of an asset in the bundle.
+
+        Args:
+            key (str): The key of the asset.
+
+        Returns:
+            tuple: The offset in the content, the length and the pixel size of the asset,
+                or None if it is not bundled.
+        """
+        self.load()
+        if key not in self.entries:
+            return None
+        offset, length, size = self.entries[key]
+        return (self.data_offset + offset, length, size)
+
+
+def get_image_key(path, size=None):
+    """
+    Get the key of an image in the bundle.
+
+    Args:
+        path (str): The path of the image file.
+        size (tuple): The width and height of the image (default: its original size).
+
+    Returns:
+        str: The key.
+    """
+    if size is None:
+        return path
+    return f"{path}@{size[0]}x{size[1]}"
+
+
+def build_bundle(path=constants.ASSET_BUNDLE, sprite_size=constants.SPRITE_SIZE):
+    """
+    Build the asset bundle from the sprite images, the logo and the font.
+
+    Args:
+        path (str): The path of the bundle file (default: constants.ASSET_BUNDLE).
+        sprite_size (int): The side length the sprites are pre-scaled to
+            (default: constants.SPRITE_SIZE).
+
+    Returns:
+        int: The size of the bundle file in bytes.
+    """
+    assets = {}
+    sources = []
+    for name in sorted(os.listdir(constants.SPRITE_DIR)):
+        source = os.path.join(constants.SPRITE_DIR, name).replace(os.sep, "/")
+        if not name.endswith(".png") or source == constants.LOGO:
+            continue
+        image = pygame.image.load(source)
+        assets[get_image_key(source)] = image
+        size = (sprite_size, sprite_size)
+        assets[get_image_key(source, size)] = pygame.transform.scale(image, size)
+        sources.append(source)
+    icon_size = (constants.ICON_SIZE, constants.ICON_SIZE)
+    icon = pygame.transform.smoothscale(pygame.image.load(constants.LOGO), icon_size)
+    assets[get_image_key(constants.LOGO, icon_size)] = icon
+    sources.append(constants.LOGO)
+    with open(constants.FONT, "rb") as file:
+        assets[constants.FONT] = file.read()
+    sources.append(constants.FONT)
+
+    entries = {}
+    chunks = []
+    offset = 0
+    for key, asset in assets.items():
+        if isinstance(asset, pygame.Surface):
+            chunk, size = pygame.image.tobytes(asset, "RGBA"), asset.get_size()
+        else:
+            chunk, size = asset, None
+        entries[key] = [offset, len(chunk), size]
+        chunks.append(chunk)
+        offset += len(chunk)
+    table = json.dumps(
+        {"entries": entries, "sources": {source: os.path.getmtime(source) for source in sources}}
+    ).encode()
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(table)))
+        file.write(table)
+        for chunk in chunks:
+            file.write(chunk)
+    return HEADER.size + len(table) + offset
+
+
+asset_bundle = AssetBundle()
+
+
+if __name__ == "__main__":
+    print(f"Wrote {constants.ASSET_BUNDLE}, {build_bundle()} bytes")
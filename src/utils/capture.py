@@ -0,0 +1,265 @@
+"""
+This module captures rendered frames and encodes them on background threads.
+
+Capturing a frame only copies the pixels of the screen into a bounded queue, so the game loop never
+waits for an encoder. Worker threads take the frames from the queue, scale them to the output size
+and either save them as a numbered PNG sequence or pipe them as raw RGB frames to an FFmpeg process.
+When the encoders fall behind and the queue is full, frames are dropped and counted instead of
+stalling the simulation, unless the capture is told to block, for off-screen rendering where every
+frame matters more than the pace. A worker that fails to write a frame, for example because FFmpeg
+exited, keeps emptying the queue without encoding, so nothing waits for it, and closing the capture
+reports the error.
+
+PNG files are encoded with NumPy and zlib rather than `pygame.image.save`, which holds the global
+interpreter lock for the whole encoding and would freeze the game loop in the meantime.
+"""
+import contextlib
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import zlib
+import numpy as np
+import pygame
+from src.utils import constants
+
+# Outputs with these extensions are encoded into a video file, any other output is a PNG directory
+VIDEO_EXTENSIONS = tuple(f".{name}" for name in constants.CAPTURE_FORMATS if name != "png")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PUT_TIMEOUT = 0.1  # Seconds between two checks for a live worker while waiting for room in the queue
+
+
+def get_capture_path(capture_dir, seed, capture_format="png"):
+    """
+    Get the output path of the captured frames of a match.
+
+    Args:
+        capture_dir (str): The directory of the captures.
+        seed (int): The seed of the match.
+        capture_format (str): One of `constants.CAPTURE_FORMATS`, "png" for a directory of
+            PNG files (default: "png").
+
+    Returns:
+        str: The path of the PNG directory or the video file.
+    """
+    if capture_format == "png":
+        return os.path.join(capture_dir, f"frames-{seed}")
+    return os.path.join(capture_dir, f"capture-{seed}.{capture_format}")
+
+
+def get_encoder_command(path, size, fps):
+    """
+    Get the command of an FFmpeg process encoding raw RGB frames read from its standard input.
+
+    Args:
+        path (str): The path of the video file.
+        size (tuple): The width and height of the frames.
+        fps (int): The frame rate of the video.
+
+    Returns:
+        list: The command and its arguments.
+    """
+    # Raw RGB frames in, a video playable everywhere out
+    return (
+        ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24"]
+        + ["-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-"]
+        + ["-pix_fmt", "yuv420p", path]
+    )
+
+
+def encode_png(pixels, size):
+    """
+    Encode RGB pixels into a PNG image.
+    Every row is stored as its difference to the row above (the "up" filter), which compresses
+    the flat background to almost nothing.
+
+    Args:
+        pixels (bytes): The RGB values of the pixels, row by row.
+        size (tuple): The width and height of the image.
+
+    Returns:
+        bytes: The PNG file.
+    """
+    width, height = size
+    rows = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width * 3)
+    filtered = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    filtered[:, 0] = 2  # Filter type of every row
+    filtered[0, 1:] = rows[0]
+    np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return (
+        PNG_SIGNATURE
+        + get_png_chunk(b"IHDR", header)
+        + get_png_chunk(b"IDAT", zlib.compress(filtered.tobytes()))
+        + get_png_chunk(b"IEND", b"")
+    )
+
+
+def get_png_chunk(kind, data):
+    """
+    Get a chunk of a PNG file.
+
+    Args:
+        kind (bytes): The four letter type of the chunk.
+        data (bytes): The content of the chunk.
+
+    Returns:
+        bytes: The chunk with its length and checksum.
+    """
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+class FrameCapture:
+    """
+    A class for capturing frames and encoding them on background threads.
+    """
+
+    def __init__(
+        self, output, size=None, fps=constants.FPS, workers=2, max_frames=32, block=False
+    ):
+        """
+        Initialize a `FrameCapture` object and start its worker threads.
+
+        Args:
+            output (str): The directory to save the frames into as PNG files, or the path of a video
+                file, encoded by FFmpeg, if it has one of the `VIDEO_EXTENSIONS`.
+            size (tuple): The width and height of the output frames (default: the captured size).
+            fps (int): The frame rate of the video (default: constants.FPS).
+            workers (int): The number of threads saving PNG files, a video has a single encoder
+                thread to keep the frames in order (default: 2).
+            max_frames (int): The number of frames waiting to be encoded before frames are dropped
+                or `capture` blocks (default: 32).
+            block (bool): Whether `capture` waits for room in the queue instead of dropping the
+                frame (default: False).
+
+        Raises:
+            FileNotFoundError: If a video is captured and FFmpeg is not installed.
+        """
+        self.output = output
+        self.size = size
+        self.fps = fps
+        self.block = block
+        self.is_video = output.lower().endswith(VIDEO_EXTENSIONS)
+        if self.is_video:
+            if shutil.which("ffmpeg") is None:
+                raise FileNotFoundError("capturing a video needs FFmpeg, capture PNG files instead")
+            workers = 1
+        else:
+            os.makedirs(output, exist_ok=True)
+        self.encoder = None  # FFmpeg process, started with the first frame once its size is known
+        self.frames = queue.Queue(maxsize=max_frames)
+        self.captured = 0  # Frames queued for encoding, also the number of the next frame
+        self.dropped = 0  # Frames dropped because the queue was full
+        self.error = None  # First error writing a frame, frames are not encoded after it
+        self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def capture(self, surface):
+        """
+        Copy the pixels of a surface and queue them for encoding.
+
+        Args:
+            surface (pygame.Surface): The surface to capture, usually the screen.
+
+        Returns:
+            bool: Whether the frame was queued, False if it was dropped.
+        """
+        frame = (self.captured, pygame.image.tobytes(surface, "RGB"), surface.get_size())
+        if not self.put(frame, self.block):
+            self.dropped += 1
+            return False
+        self.captured += 1
+        return True
+
+    def put(self, item, block):
+        """
+        Queue a frame or the end marker of a worker.
+
+        Args:
+            item (tuple): The frame, None for the end marker.
+            block (bool): Whether to wait for room in the queue.
+
+        Returns:
+            bool: Whether the item was queued, False if the queue is full and either the capture
+            does not block or no worker is left to empty the queue.
+        """
+        while True:
+            try:
+                self.frames.put(item, block=block, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                if not block or not any(thread.is_alive() for thread in self.threads):
+                    return False
+
+    def run(self):
+        """
+        Encode the queued frames until the capture is closed.
+        """
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self.encode(*frame)
+            except OSError as error:
+                self.error = error
+
+    def encode(self, number, pixels, size):
+        """
+        Scale a frame to the output size and save it or pipe it to the video encoder.
+
+        Args:
+            number (int): The number of the frame.
+            pixels (bytes): The RGB values of the pixels.
+            size (tuple): The width and height of the frame.
+        """
+        if self.size is not None and self.size != size:
+            image = pygame.image.frombytes(pixels, size, "RGB")
+            image = pygame.transform.smoothscale(image, self.size)
+            pixels, size = pygame.image.tobytes(image, "RGB"), self.size
+        if self.is_video:
+            self.write_video_frame(pixels, size)
+        else:
+            path = os.path.join(self.output, f"frame-{number:06d}.png")
+            with open(path, "wb") as file:
+                file.write(encode_png(pixels, size))
+
+    def write_video_frame(self, pixels, size):
+        """
+        Pipe a frame to the FFmpeg process, starting it with the first frame.
+
+        Args:
+            pixels (bytes): The RGB values of the pixels at the output size.
+            size (tuple): The output width and height.
+        """
+        if self.encoder is None:
+            self.encoder = subprocess.Popen(
+                get_encoder_command(self.output, size, self.fps), stdin=subprocess.PIPE
+            )
+        self.encoder.stdin.write(pixels)
+
+    def close(self):
+        """
+        Encode the queued frames, stop the threads and finish the video file, if any.
+
+        Raises:
+            RuntimeError: If a frame could not be written or FFmpeg failed.
+        """
+        for _ in self.threads:
+            self.put(None, True)
+        for thread in self.threads:
+            thread.join()
+        if self.encoder is not None:
+            with contextlib.suppress(BrokenPipeError):
+                self.encoder.stdin.close()
+            code = self.encoder.wait()
+            self.encoder = None
+            if code != 0 and self.error is None:
+                self.error = OSError(f"FFmpeg exited with code {code}")
+        if self.error is not None:
+            raise RuntimeError(f"capturing into {self.output} failed: {self.error}")
@@ -5,6 +5,37 @@ This module defines a set of constants commonly used in the application.
 # Screen resolution
 RESOLUTION = 500
 
+# Maximum number of frames rendered per second
+FPS = 60
+
+# Simulation steps per second at normal speed, one step per frame like the original game
+STEP_RATE = 60
+
+# Fast-forward multipliers of the step rate, selectable during the game
+FAST_FORWARD_RATES = (1, 2, 5, 10, 20, 50)
+
+# Frames that can be skipped in a row while the simulation catches up
+MAX_DROPPED_FRAMES = 5
+
+# Height of the score bar area at the bottom of the screen, sprites stay above it
+SCORE_BAR_MARGIN = 40
+
+# Default size of the world the sprites move in, the area of the window above the score bars
+WORLD_WIDTH = RESOLUTION
+WORLD_HEIGHT = RESOLUTION - SCORE_BAR_MARGIN
+
+# Camera zoom limits, below DENSITY_ZOOM the sprites are drawn as a density map
+MAX_ZOOM = 4
+ZOOM_STEP = 1.25  # Zoom multiplier of one mouse wheel notch or key press
+DENSITY_ZOOM = 0.5
+
+# Captured frames are saved as PNG files or encoded into a video file of one of these formats
+CAPTURE_FORMATS = ("png", "mp4", "mkv", "webm", "mov", "avi")
+
+# Ways to handle a match whose winner is decided: simulate it to the end, stop and report
+# the winner, or stop and also estimate the length of the whole match
+ENDGAME_MODES = ("play", "decide", "estimate")
+
 # Background color
 BGCOLOR = (255, 253, 242)
 
@@ -12,8 +43,38 @@ BGCOLOR = (255, 253, 242)
 ROCK_COLOR = (166, 208, 221)
 PAPER_COLOR = (255, 211, 176)
 SCISSORS_COLOR = (255, 105, 105)
+SPOCK_COLOR = (178, 164, 255)
+LIZARD_COLOR = (160, 214, 131)
+SPECIES_COLORS = {
+    "rock": ROCK_COLOR,
+    "paper": PAPER_COLOR,
+    "scissors": SCISSORS_COLOR,
+    "spock": SPOCK_COLOR,
+    "lizard": LIZARD_COLOR,
+}
+# Colors of the species that have no color above, picked by the name of the species
+FALLBACK_COLORS = ((255, 190, 92), (120, 200, 200), (220, 140, 200), (150, 150, 150))
+
+# Sprite attributes
+SPRITE_SIZE = 15
+HITBOX_RATIO = 0.7  # Fraction of the sprite size a hunter has to close in to eat
+HUNTER_RADIUS = 200  # Sprites start evading hunters closer than this
+
+# Level of detail: sprites whose closest prey and hunter are farther than this, plus the distance
+# both can close in until the next full update, only search for them every few steps
+LOD_RADIUS = 100
+MAX_LOD_INTERVAL = 8  # Most steps between two full updates of a distant sprite
+
+# Cached targets are searched again once they are this much farther away than when they were found
+TARGET_TOLERANCE = 20
 
 # Text attributes
 TEXTCOLOR = (43, 57, 61)
 TEXTCOLOR_HIGHLIGHTED = (75, 100, 110)
 FONT = "assets/font/PressStart2P-vaV7.ttf"
+
+# Asset files, and the bundle of the pre-scaled sprites, icon and font built from them
+SPRITE_DIR = "assets/sprites"
+LOGO = "assets/sprites/logo.png"
+ICON_SIZE = 64
+ASSET_BUNDLE = "assets/bundle.rpsa"
@@ -0,0 +1,201 @@
+"""
+This module defines the `FrameProfiler` class, which measures how long each phase of a frame takes.
+
+Phases are timed with `time.perf_counter_ns` and summed per frame. The last frames are kept in a
+rolling window per phase for the mean and tail percentiles, and a bounded trace of every frame can
+be written to a CSV or JSON file. A disabled or missing profiler hands out a shared context that
+does nothing, so the instrumented code costs next to nothing while profiling is off.
+"""
+import csv
+import json
+import time
+from collections import deque
+import numpy as np
+
+
+class FrameProfiler:
+    """
+    A class for timing the phases of every frame.
+    """
+
+    def __init__(self, enabled=False, window=120, trace_frames=36000):
+        """
+        Initialize a `FrameProfiler` object.
+
+        Args:
+            enabled (bool): Whether phases are timed (default: False).
+            window (int): The number of frames the statistics are computed over (default: 120).
+            trace_frames (int): The number of frames kept for the trace, ten minutes at 60 FPS
+                by default.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.durations = {}  # Rolling window of the nanoseconds spent in every phase per frame
+        self.calls = {}  # Rolling window of the number of times every phase ran per frame
+        self.frame = {}  # Nanoseconds spent in every phase of the current frame
+        self.frame_calls = {}  # Number of times every phase ran in the current frame
+        self.frame_start = None
+        self.trace = deque(maxlen=trace_frames)
+
+    def phase(self, name):
+        """
+        Time a phase of the current frame, repeated phases are summed.
+
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            Phase: The timing context, which does nothing while the profiler is disabled.
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def add(self, name, duration):
+        """
+        Add the duration of one run of a phase to the current frame.
+
+        Args:
+            name (str): The name of the phase.
+            duration (int): The duration in nanoseconds.
+        """
+        self.frame[name] = self.frame.get(name, 0) + duration
+        self.frame_calls[name] = self.frame_calls.get(name, 0) + 1
+
+    def start_frame(self):
+        """
+        Start timing a new frame.
+        """
+        self.frame = {}
+        self.frame_calls = {}
+        self.frame_start = time.perf_counter_ns() if self.enabled else None
+
+    def end_frame(self):
+        """
+        Finish the current frame and add its phases to the statistics and the trace.
+        """
+        if self.frame_start is None:
+            return
+        self.add("frame", time.perf_counter_ns() - self.frame_start)
+        for name, duration in self.frame.items():
+            if name not in self.durations:
+                self.durations[name] = deque(maxlen=self.window)
+                self.calls[name] = deque(maxlen=self.window)
+            self.durations[name].append(duration)
+            self.calls[name].append(self.frame_calls[name])
+        self.trace.append((time.time(), self.frame))
+        self.frame_start = None
+
+    def get_stats(self):
+        """
+        Get the statistics of every phase over the rolling window.
+
+        Returns:
+            dict: The mean, median, 95th and 99th percentile in milliseconds per frame of every
+            phase, and its mean duration per run.
+        """
+        stats = {}
+        for name, durations in self.durations.items():
+            milliseconds = np.array(durations) / 1e6
+            p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+            stats[name] = {
+                "mean_ms": float(milliseconds.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "per_call_ms": float(milliseconds.sum() / sum(self.calls[name])),
+            }
+        return stats
+
+    def get_fps(self):
+        """
+        Get the frame rate over the rolling window.
+
+        Returns:
+            float: The number of frames per second, 0 before the second frame.
+        """
+        if len(self.trace) < 2:
+            return 0.0
+        frames = min(len(self.trace), self.window)
+        elapsed = self.trace[-1][0] - self.trace[-frames][0]
+        return (frames - 1) / elapsed if elapsed > 0 else 0.0
+
+    def dump(self, path):
+        """
+        Write the trace of the recorded frames, as CSV if the path ends with .csv, else as JSON.
+
+        Args:
+            path (str): The path of the trace file.
+        """
+        names = sorted({name for _, frame in self.trace for name in frame})
+        rows = [
+            [timestamp] + [frame.get(name, 0) / 1e6 for name in names]
+            for timestamp, frame in self.trace
+        ]
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            if path.endswith(".csv"):
+                writer = csv.writer(file)
+                writer.writerow(["time"] + [f"{name}_ms" for name in names])
+                writer.writerows(rows)
+            else:
+                json.dump(
+                    {"phases": names, "frames": rows, "stats": self.get_stats()},
+                    file,
+                )
+
+
+def profile(profiler, name):
+    """
+    Time a phase if a profiler is given.
+
+    Args:
+        profiler (FrameProfiler): The profiler, or None.
+        name (str): The name of the phase.
+
+    Returns:
+        Phase: The timing context, which does nothing without a profiler.
+    """
+    if profiler is None:
+        return NULL_PHASE
+    return profiler.phase(name)
+
+
+class Phase:
+    """
+    A context manager adding the time spent inside it to a phase of the current frame.
+    """
+
+    def __init__(self, profiler, name):
+        """
+        Initialize a `Phase` object.
+
+        Args:
+            profiler (FrameProfiler): The profiler of the frame.
+            name (str): The name of the phase.
+        """
+        self.profiler = profiler
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class NullPhase:
+    """
+    A reusable context manager doing nothing, used while profiling is off.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = NullPhase()
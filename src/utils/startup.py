@@ -0,0 +1,70 @@
+"""
+This module defines the `StartupTimer` class, which times the phases of the game startup.
+
+A phase lasts from the previous mark to its own, the first one from the start of the process:
+importing the modules, opening the window, loading the icon and rendering the first frame of the
+first screen. The first frame of every screen shown later is timed from the moment the previous
+screen closed, so the time spent on the previous screen is left out but creating the screen is not.
+"""
+import sys
+import time
+
+
+class StartupTimer:
+    """
+    A class for timing the startup phases of the game.
+    """
+
+    def __init__(self, start=None, enabled=False):
+        """
+        Initialize a `StartupTimer` object.
+
+        Args:
+            start (float): The `time.perf_counter` value the startup began at (default: now).
+            enabled (bool): Whether every phase is printed on the standard error when it ends
+                (default: False).
+        """
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start  # End of the previous phase
+        self.phases = []  # Name and seconds of every finished phase
+        self.shown_screens = set()  # Screens whose first frame was timed
+        self.first_frame = None  # Seconds from the start to the first rendered frame
+
+    def mark(self, phase):
+        """
+        End a phase.
+
+        Args:
+            phase (str): The name of the phase.
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        if self.enabled:
+            print(f"startup {phase:<24}{(now - self.last) * 1000:>8.1f} ms", file=sys.stderr)
+        self.last = now
+
+    def mark_frame(self, screen):
+        """
+        End the phase of the first frame of a screen, if it is the first frame of that screen.
+
+        Args:
+            screen (str): The name of the screen.
+        """
+        if screen in self.shown_screens:
+            return
+        self.shown_screens.add(screen)
+        self.mark(f"{screen} first frame")
+        if self.first_frame is None:
+            self.first_frame = self.last - self.start
+            if self.enabled:
+                print(
+                    f"startup {'time to first frame':<24}{self.first_frame * 1000:>8.1f} ms",
+                    file=sys.stderr,
+                )
+
+    def restart(self):
+        """
+        Start the next phase now, leaving out the time since the previous mark.
+        """
+        self.last = time.perf_counter()
@@ -0,0 +1,96 @@
+"""
+This module defines the `TextCache` class, a process-wide cache of fonts and rendered texts.
+
+Fonts are kept for every (path, size) pair, so the TTF file is parsed once. Rendered text surfaces
+are kept in a bounded least recently used cache keyed by (text, size, color), so the menu and
+game over screens stop re-rendering the same strings every frame. Hit and miss counters show how
+well both caches work. Font files in the asset bundle are read from the bundle.
+"""
+from collections import OrderedDict
+import pygame
+from src.utils import constants
+from src.utils.bundle import asset_bundle
+
+
+class TextCache:
+    """
+    A class for caching fonts and rendered text surfaces.
+    """
+
+    def __init__(self, max_texts=128):
+        """
+        Initialize an empty `TextCache` object.
+
+        Args:
+            max_texts (int): The maximum number of rendered texts to keep (default: 128).
+        """
+        self.max_texts = max_texts
+        self.fonts = {}  # Font of every (path, size)
+        self.texts = OrderedDict()  # Rendered surface of every (path, text, size, color)
+        self.stats = {"font_hits": 0, "font_misses": 0, "text_hits": 0, "text_misses": 0}
+
+    def get_font(self, size, path=constants.FONT):
+        """
+        Get a font, loading it on first use.
+
+        Args:
+            size (int): The font size.
+            path (str): The path of the font file (default: constants.FONT).
+
+        Returns:
+            pygame.font.Font: The shared font.
+        """
+        key = (path, size)
+        if key in self.fonts:
+            self.stats["font_hits"] += 1
+        else:
+            self.stats["font_misses"] += 1
+            file = asset_bundle.open(path)
+            self.fonts[key] = pygame.font.Font(file if file is not None else path, size)
+        return self.fonts[key]
+
+    def render(self, text, size, color, path=constants.FONT):
+        """
+        Get the rendered surface of a text, rendering it if it is not cached.
+
+        Args:
+            text (str): The text to render.
+            size (int): The font size.
+            color (tuple): The RGB color value of the text.
+            path (str): The path of the font file (default: constants.FONT).
+
+        Returns:
+            pygame.Surface: The shared surface, callers must not draw on it.
+        """
+        key = (path, text, size, color)
+        if key in self.texts:
+            self.stats["text_hits"] += 1
+            self.texts.move_to_end(key)
+            return self.texts[key]
+
+        self.stats["text_misses"] += 1
+        surface = self.get_font(size, path).render(text, 1, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)  # Drop the least recently used text
+        return surface
+
+    def get_stats(self):
+        """
+        Get the hit and miss counters of the font and text caches.
+
+        Returns:
+            dict: The number of font and text cache hits and misses.
+        """
+        return dict(self.stats)
+
+    def clear(self):
+        """
+        Remove every cached font and text and reset the counters.
+        """
+        self.fonts.clear()
+        self.texts.clear()
+        self.stats = dict.fromkeys(self.stats, 0)
+
+
+text_cache = TextCache()
@@ -0,0 +1,44 @@
+"""
+Tests of the `Simulation` class.
+"""
+import numpy as np
+import pytest
+from src.simulation.engine import Simulation
+
+
+class ExhaustiveSimulation(Simulation):
+    """
+    A simulation checking every sprite against the whole group while the group settles.
+    """
+
+    def find_neighbours(self, movers, members, moved_x, moved_y):
+        """
+        Get every other sprite of the group as possible neighbour of every mover.
+
+        Args:
+            movers (numpy.ndarray): The indices of the moving sprites.
+            members (numpy.ndarray): The indices of the sprites of the group, in ascending order.
+            moved_x (numpy.ndarray): The x coordinate of every mover after it moved.
+            moved_y (numpy.ndarray): The y coordinate of every mover after it moved.
+
+        Returns:
+            list: The indices of the other sprites of the group for every mover.
+        """
+        members = members.tolist()
+        return [[member for member in members if member != mover] for mover in movers.tolist()]
+
+
+@pytest.mark.parametrize("speed, group_size", [(2, 150), (10, 150), (10, 300)])
+def test_settle_matches_exhaustive_search(speed, group_size):
+    """
+    The grid finds every sprite a mover overlaps while its group settles, so matches play out
+    the same as when every mover is checked against its whole group.
+    """
+    simulation = Simulation(speed, group_size, np.random.default_rng(0))
+    exhaustive = ExhaustiveSimulation(speed, group_size, np.random.default_rng(0))
+    for _ in range(40):
+        simulation.step()
+        exhaustive.step()
+        assert np.array_equal(simulation.x, exhaustive.x)
+        assert np.array_equal(simulation.y, exhaustive.y)
+        assert np.array_equal(simulation.species, exhaustive.species)
@@ -0,0 +1,81 @@
+"""
+Tests of the snapshots of a simulation.
+"""
+import numpy as np
+from src.simulation.engine import Simulation
+from src.simulation.snapshot import load_snapshot, take_snapshot
+
+
+def run_restored(tmp_path, configure):
+    """
+    Take a snapshot of a match, save and load it, and play the original and the restored match on.
+
+    Args:
+        tmp_path (pathlib.Path): The directory of the snapshot file.
+        configure (function): Called with a simulation to set its options before it steps.
+
+    Returns:
+        tuple: The original and the restored simulation, both 60 steps after the snapshot.
+    """
+    # A world large enough for some sprites to be far from any prey and hunter
+    original = Simulation(2, 50, np.random.default_rng(1), 1500, 1460)
+    configure(original)
+    for _ in range(60):
+        original.step()
+    path = tmp_path / "snapshot.npz"
+    take_snapshot(original, 1).save(path)
+    restored = load_snapshot(path).create_simulation()
+    configure(restored)
+    for _ in range(60):
+        original.step()
+        restored.step()
+    return original, restored
+
+
+def assert_same_state(original, restored):
+    """
+    Check that two simulations hold the same sprites.
+
+    Args:
+        original (Simulation): The original simulation.
+        restored (Simulation): The restored simulation.
+    """
+    assert restored.steps == original.steps
+    assert np.array_equal(restored.x, original.x)
+    assert np.array_equal(restored.y, original.y)
+    assert np.array_equal(restored.species, original.species)
+
+
+def test_restore_continues_like_the_original(tmp_path):
+    """
+    A restored match plays on exactly like the match the snapshot was taken of.
+    """
+    assert_same_state(*run_restored(tmp_path, lambda simulation: None))
+
+
+def test_restore_keeps_level_of_detail_state(tmp_path):
+    """
+    Distant sprites keep coasting after a restore, so matches with a level of detail interval
+    play on exactly like the original.
+    """
+
+    def configure(simulation):
+        simulation.lod_interval = 4
+
+    original, restored = run_restored(tmp_path, configure)
+    assert original.distant.any()
+    assert_same_state(original, restored)
+
+
+def test_restore_keeps_cached_targets(tmp_path):
+    """
+    Sprites keep their cached prey and hunter after a restore, so matches with a target refresh
+    interval play on exactly like the original.
+    """
+
+    def configure(simulation):
+        simulation.target_refresh = 4
+
+    original, restored = run_restored(tmp_path, configure)
+    assert original.prey_cache.stats["hits"] > 0
+    assert_same_state(original, restored)